@@ -0,0 +1,40 @@
+"""
+Throughput of the local mood classifier (utils.lexicon) on synthetic journal texts:
+one classify_moods batch vs. calling classify_mood per text.
+
+Run from the project root:  python benchmarks/bench_mood.py [n_texts ...]
+(default: 1000 10000 100000)
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from synthetic import generate_logs # noqa: E402
+
+from utils.lexicon import classify_mood, classify_moods # noqa: E402
+
+
+def journal_texts(n):
+    """`n` synthetic journal texts (5-40 words each)."""
+    logs = generate_logs(n / 365 + 1, miss_rate=0)
+    return [log["journal_text"] for log in logs[:n]]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'texts':>8} {'batch ms':>10} {'texts/s':>12} {'single ms':>10} {'texts/s':>12}")
+    for n in sizes:
+        texts = journal_texts(n)
+        assert classify_moods(texts) == [classify_mood(t) for t in texts]
+
+        runs = 3
+        t_batch = min(timeit.repeat(lambda: classify_moods(texts), number=1, repeat=runs))
+        t_single = min(timeit.repeat(lambda: [classify_mood(t) for t in texts], number=1, repeat=runs))
+        print(f"{n:>8} {t_batch * 1000:>10.1f} {n / t_batch:>12,.0f} {t_single * 1000:>10.1f} {n / t_single:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
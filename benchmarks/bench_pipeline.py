@@ -0,0 +1,127 @@
+"""
+End-to-end timings of the dashboard data pipeline on synthetic histories, served
+over HTTP by the local stub backend:
+
+  fetch      GET /get_all_logs + JSON decode
+  compact    to_compact (typed columns, journals split off)
+  stream     stream_logs: incremental parse into typed columns, journals skipped
+  aggregate  compute_aggregates (streaks, totals, counts)
+  delta      one new /log, then an incremental LogStore sync
+  calendar   calplot render of the latest year (cache bypassed)
+  trend      trend_frame + Plotly figure serialization ("All" range)
+  summary    summarize_history for the AI Insights prompt
+
+Run from the project root:  python benchmarks/bench_pipeline.py [years ...]
+(default: 1 5 20; --runs N repeats each stage and keeps the best).
+Also reports peak Python heap (tracemalloc) of fetch + compact vs. stream.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stub_backend import start_stub_backend # noqa: E402
+from synthetic import generate_logs # noqa: E402
+
+logging.getLogger("streamlit").setLevel(logging.ERROR) # "No runtime found" warnings outside `streamlit run`
+
+from utils.aggregates import compute_aggregates # noqa: E402
+from utils.backend import BackendClient # noqa: E402
+from utils.charts import render_habit_calendar, trend_frame # noqa: E402
+from utils.data import LogStore # noqa: E402
+from utils.history import summarize_history # noqa: E402
+from utils.schema import to_compact, to_records # noqa: E402
+
+STAGES = ["fetch", "compact", "stream", "aggregate", "delta", "calendar", "trend", "summary"]
+
+
+def best_of(runs, fn):
+    """Returns (best seconds, last result) over `runs` calls."""
+    best, result = float("inf"), None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_kb(fn):
+    """Peak traced allocation (KB) while running fn()."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_years(years, runs):
+    import plotly.express as px
+
+    logs = generate_logs(years)
+    server, url = start_stub_backend(logs)
+    try:
+        client = BackendClient(url)
+        timings = {}
+
+        timings["fetch"], raw = best_of(runs, client.get_all_logs)
+        timings["compact"], (frame, journals) = best_of(runs, lambda: to_compact(raw))
+        timings["stream"], _ = best_of(runs, lambda: client.stream_logs(journals=False))
+        server.state.logs_body(None) # Encoded once, outside the measured window
+        peak_json = peak_kb(lambda: to_compact(client.get_all_logs()))
+        peak_stream = peak_kb(lambda: client.stream_logs(journals=False))
+        timings["aggregate"], aggregates = best_of(runs, lambda: compute_aggregates(frame))
+
+        store = LogStore(client=client)
+        store.frame()
+
+        def delta_sync():
+            client.save_log({**logs[-1], "journal_text": "One more entry."})
+            store.invalidate()
+            return store.frame()
+        timings["delta"], _ = best_of(runs, delta_sync)
+
+        totals, fingerprint = aggregates.daily_totals, aggregates.daily_fingerprint
+        latest_year = (int(totals.index.year.max()),)
+        timings["calendar"], png = best_of(
+            runs, lambda: render_habit_calendar.__wrapped__(fingerprint, totals, latest_year)
+        )
+
+        def trend():
+            df, _ = trend_frame.__wrapped__(fingerprint, totals, None)
+            return px.line(df, x='date', y=['total_habits', 'rolling_avg']).to_json()
+        timings["trend"], trend_json = best_of(runs, trend)
+
+        records = to_records(frame, journals)
+        timings["summary"], summary = best_of(runs, lambda: summarize_history(records))
+    finally:
+        server.shutdown()
+
+    sizes = {"logs": len(logs), "png_kb": len(png) / 1024, "trend_kb": len(trend_json) / 1024,
+             "summary_chars": len(summary), "peak_json_kb": peak_json, "peak_stream_kb": peak_stream}
+    return timings, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard data pipeline benchmark")
+    parser.add_argument("years", nargs="*", type=float, default=[1, 5, 20])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'years':>6} {'logs':>6} " + " ".join(f"{s:>10}" for s in STAGES) + "   (ms)")
+    for years in args.years:
+        timings, sizes = bench_years(years, args.runs)
+        print(f"{years:>6g} {sizes['logs']:>6} " + " ".join(f"{timings[s] * 1000:>10.1f}" for s in STAGES))
+        print(f"{'':>13} calendar {sizes['png_kb']:.0f} KB, trend JSON {sizes['trend_kb']:.0f} KB, "
+              f"prompt summary {sizes['summary_chars']} chars")
+        print(f"{'':>13} peak heap: fetch+compact {sizes['peak_json_kb']:,.0f} KB, "
+              f"stream {sizes['peak_stream_kb']:,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
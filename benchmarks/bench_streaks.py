@@ -0,0 +1,76 @@
+"""
+Compares the old loop-based streak calculation with utils.streaks.compute_streaks
+on synthetic daily logs.
+
+Run from the project root:  python benchmarks/bench_streaks.py [years]
+"""
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.streaks import compute_streaks # noqa: E402
+
+
+def legacy_calculate_streaks(active_dates_list):
+    """The original dashboard implementation (Python loop + list membership)."""
+    if active_dates_list.size == 0:
+        return 0, 0
+    sorted_dates = sorted(list(set(active_dates_list)))
+    longest_streak, current_temp_streak = 0, 1
+    for i in range(1, len(sorted_dates)):
+        if sorted_dates[i] == sorted_dates[i-1] + timedelta(days=1):
+            current_temp_streak += 1
+        else:
+            longest_streak = max(longest_streak, current_temp_streak)
+            current_temp_streak = 1
+    longest_streak = max(longest_streak, current_temp_streak)
+
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    current_streak = 0
+    for anchor in (today, yesterday):
+        if anchor in sorted_dates:
+            current_streak = 1
+            temp_date = anchor - timedelta(days=1)
+            while temp_date in sorted_dates:
+                current_streak += 1
+                temp_date -= timedelta(days=1)
+            break
+    return current_streak, longest_streak
+
+
+def synthetic_dates(years, miss_rate=0.02, seed=0):
+    """Daily dates ending today, with a fraction of days randomly skipped."""
+    rng = np.random.default_rng(seed)
+    days = np.arange(years * 365)
+    kept = days[rng.random(days.size) >= miss_rate]
+    # Keep the last 60 days unbroken so the current streak is long (worst case for the loop)
+    kept = np.union1d(kept, np.arange(days.size - 60, days.size))
+    today = date.today()
+    return np.array([today - timedelta(days=int(days.size - 1 - d)) for d in kept])
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    dates = synthetic_dates(years)
+
+    legacy = legacy_calculate_streaks(dates)
+    summary = compute_streaks(dates)
+    assert legacy == (summary.current, summary.longest), (legacy, summary[:2])
+
+    runs = 5
+    t_legacy = min(timeit.repeat(lambda: legacy_calculate_streaks(dates), number=1, repeat=runs))
+    t_new = min(timeit.repeat(lambda: compute_streaks(dates), number=1, repeat=runs))
+
+    print(f"{years} years, {dates.size} logged days, {len(summary.runs)} streak runs")
+    print(f"legacy loop      : {t_legacy * 1000:8.2f} ms")
+    print(f"compute_streaks  : {t_new * 1000:8.2f} ms  ({t_legacy / t_new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Reports the import cost of the app's heavy dependencies and of our own modules,
+each measured in a fresh interpreter with `python -X importtime`.
+
+Run from the project root:
+    python benchmarks/import_times.py             # table, slowest first
+    python benchmarks/import_times.py --json      # machine-readable, for tracking over time
+    python benchmarks/import_times.py --fail-above 1500   # exit 1 if any module exceeds 1500 ms
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = [
+    "streamlit",
+    "pandas",
+    "numpy",
+    "requests",
+    "PIL.Image",
+    "plotly.express",
+    "matplotlib.pyplot",
+    "calplot",
+    "langchain_core.prompts",
+    "langchain_google_genai",
+    # Our own modules (includes whatever they import at top level)
+    "utils.data",
+    "utils.charts",
+    "utils.history",
+    "utils.outbox",
+]
+
+# "import time: self [us] | cumulative | imported package"
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+
+def measure(module):
+    """Cumulative import time of `module` in ms, or None if it isn't installed."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return None
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match and match.group(3).strip() == module:
+            return int(match.group(2)) / 1000
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--fail-above", type=float, metavar="MS", help="exit 1 if any module is slower")
+    args = parser.parse_args()
+
+    results = {module: measure(module) for module in MODULES}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for module, ms in sorted(results.items(), key=lambda kv: -(kv[1] or 0)):
+            print(f"{module:<26} {'not installed' if ms is None else f'{ms:8.1f} ms'}")
+
+    if args.fail_above is not None:
+        slow = {m: ms for m, ms in results.items() if ms is not None and ms > args.fail_above}
+        if slow:
+            print(f"Over {args.fail_above} ms: {', '.join(slow)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
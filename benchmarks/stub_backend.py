@@ -0,0 +1,141 @@
+"""
+A local stand-in for the MindTrack backend, serving synthetic logs so the app and
+benchmarks can run without the real API.
+
+Endpoints: GET /get_all_logs[?since=YYYY-MM-DD], POST /log, POST /predict_mood,
+POST /reset_logs. Optional latency (seconds) is added to every response.
+
+    python benchmarks/stub_backend.py --years 5 --port 8000
+    BACKEND_URL=http://127.0.0.1:8000 streamlit run streamlit_app.py
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from synthetic import generate_logs # noqa: E402
+
+
+class StubState:
+    """The stub's log table (keyed by date) and request counters."""
+
+    def __init__(self, logs, latency=0.0):
+        self.initial = list(logs)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.logs = {entry["date"]: entry for entry in logs}
+        self.requests = {}
+        self._bodies = {} # since -> encoded /get_all_logs response, until the logs change
+
+    def logs_body(self, since):
+        """
+        The encoded /get_all_logs response. Cached so serving a request allocates
+        (almost) nothing in this process, which keeps client-side memory numbers clean.
+        """
+        with self.lock:
+            body = self._bodies.get(since)
+            if body is None:
+                logs = [self.logs[d] for d in sorted(self.logs) if since is None or d >= since]
+                body = self._bodies[since] = json.dumps(logs).encode()
+            return body
+
+    def set_logs(self, logs):
+        with self.lock:
+            self.logs = {entry["date"]: entry for entry in logs}
+            self._bodies.clear()
+
+    def save(self, entry):
+        with self.lock:
+            self.logs[entry["date"]] = entry
+            self._bodies.clear()
+
+    def count(self, endpoint):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+
+def _make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # Keep-alive, like a real API server
+
+        def log_message(self, *args): # Quiet
+            pass
+
+        def _send_json(self, payload, status=200):
+            self._send_body(json.dumps(payload).encode(), status)
+
+        def _send_body(self, body, status=200):
+            if state.latency:
+                time.sleep(state.latency)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/get_all_logs":
+                return self._send_json({"error": "not found"}, 404)
+            state.count("get_all_logs")
+            since = parse_qs(url.query).get("since", [None])[0]
+            self._send_body(state.logs_body(since))
+
+        def do_POST(self):
+            endpoint = urlparse(self.path).path.lstrip("/")
+            payload = self._read_json()
+            state.count(endpoint)
+            if endpoint == "log":
+                state.save(payload)
+                self._send_json({"status": "ok"})
+            elif endpoint == "predict_mood":
+                self._send_json({"mood": "Neutral"})
+            elif endpoint == "reset_logs":
+                state.set_logs(state.initial)
+                self._send_json({"status": "ok"})
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+    return Handler
+
+
+def start_stub_backend(logs, host="127.0.0.1", port=0, latency=0.0):
+    """
+    Starts the stub in a daemon thread and returns (server, base_url).
+    port=0 picks a free port. Call server.shutdown() when done.
+    """
+    state = StubState(logs, latency=latency)
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="stub-backend", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=float, default=1)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    server, url = start_stub_backend(generate_logs(args.years), port=args.port, latency=args.latency)
+    print(f"Stub backend with {len(server.state.logs)} logs on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Synthetic MindTrack logs for benchmarks: one entry per logged day, ending today,
+in the same shape as /get_all_logs returns.
+
+    python benchmarks/synthetic.py 5 > logs.json   # 5 years as a JSON array
+"""
+import json
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+
+HABITS = ["exercise", "water", "reading", "meditation"]
+MOODS = ["Happy", "Neutral", "Sad", "Angry"]
+
+_WORDS = (
+    "today felt calm busy tired focused slow great long short walk work read water "
+    "sleep friends family rain sun coffee run stretch quiet music proud stressed"
+).split()
+
+
+def generate_logs(years, habit_density=0.6, journal_words=(5, 40), miss_rate=0.02, seed=0):
+    """
+    Returns `years` of daily logs (oldest first) as a list of dicts.
+
+    habit_density: probability that each habit is done on a logged day.
+    journal_words: (min, max) number of words per journal entry.
+    miss_rate:     fraction of days with no log at all.
+    """
+    rng = np.random.default_rng(seed)
+    n_days = int(years * 365)
+    today = date.today()
+
+    kept = np.flatnonzero(rng.random(n_days) >= miss_rate)
+    habits = rng.random((kept.size, len(HABITS))) < habit_density
+    moods = rng.integers(0, len(MOODS), kept.size)
+    lengths = rng.integers(journal_words[0], journal_words[1] + 1, kept.size)
+    words = rng.integers(0, len(_WORDS), int(lengths.sum()))
+
+    logs = []
+    offset = 0
+    for i, d in enumerate(kept):
+        text = " ".join(_WORDS[w] for w in words[offset:offset + lengths[i]])
+        offset += lengths[i]
+        entry = {"date": (today - timedelta(days=int(n_days - 1 - d))).isoformat()}
+        entry.update({habit: int(done) for habit, done in zip(HABITS, habits[i])})
+        entry["mood"] = MOODS[moods[i]]
+        entry["journal_text"] = text.capitalize() + "."
+        logs.append(entry)
+    return logs
+
+
+if __name__ == "__main__":
+    json.dump(generate_logs(float(sys.argv[1]) if len(sys.argv) > 1 else 1), sys.stdout)
@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.prefetch import prefetch_on_start
 
 # --- Page Configuration ---
 
@@ -32,6 +33,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Warm the dashboard in the background (once per session)
+prefetch_on_start()
+
 # --- Welcome Page Content ---
 st.title("Welcome to MindTrack! 👋")
 st.markdown(
@@ -1,20 +1,16 @@
 import streamlit as st
-import pandas as pd
 import requests
 import datetime
-import os
-from PIL import Image
 from dotenv import load_dotenv
+from utils.assets import ICON_SIZE, load_icons
+from utils.backend import get_backend_client
+from utils.mood import MOOD_PREDICTION_MODE, get_prediction_cache, predict_mood, submit_log_with_pending_mood
+from utils.outbox import get_outbox_flusher, submit_log
+from utils.prefetch import prefetch_on_start
+from utils.timing import debug_toggle, render_debug_panel, stage
 
 load_dotenv()
 
-# --- Configuration ---
-BACKEND_URL = os.getenv("BACKEND_URL")
-LOG_ENDPOINT = f"{BACKEND_URL}/log"
-LOCAL_LOG_FILE = "data/logs.csv"
-
-print(f"BACKEND_URL : {BACKEND_URL}")
-
 # ----- To hide default page show -----
 st.markdown("""
     <style>
@@ -36,6 +32,8 @@ with st.sidebar:
     st.page_link("pages/3_AI_insights.py", label="AI Insights", icon="✨")
     st.page_link("pages/0_Welcome.py", label="About", icon="👋")
 
+    debug_toggle()
+
 # --- Page Configuration ---
 
 st.set_page_config(
@@ -45,50 +43,17 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# --- Helper to load images ---
-# @st.cache_data
-def load_image(path):
-    """Safely loads an image, returns None if not found."""
-    try:
-        # Assumes your assets folder is at the root, relative to where streamlit_app.py is
-        return Image.open(path)
-    except FileNotFoundError:
-        st.warning(f"Icon not found at {path}")
-        return None
+# Sync the logs and precompute the dashboard in the background while the user logs
+prefetch_on_start()
 
 # --- Load Icons ---
-water_icon = load_image("assets/icons/water.png")
-read_icon = load_image("assets/icons/reading.png")
-meditate_icon = load_image("assets/icons/meditation.png")
-exercise_icon = load_image("assets/icons/exercise.png")
-
-
-# --- Helper Functions ---
-def save_log_locally(log_entry):
-    """Saves the log entry to a local CSV file as a fallback."""
-    try:
-        df_entry = pd.DataFrame([log_entry])
-        if not os.path.exists(LOCAL_LOG_FILE):
-            df_entry.to_csv(LOCAL_LOG_FILE, index=False)
-        else:
-            df_entry.to_csv(LOCAL_LOG_FILE, mode='a', header=False, index=False)
-        return True
-    except Exception as e:
-        st.error(f"Failed to save log locally: {e}")
-        return False
-
-def save_log_to_backend(log_entry):
-    """Tries to save the log entry to the backend."""
-    try:
-        response = requests.post(LOG_ENDPOINT, json=log_entry)
-        if response.status_code == 201:
-            return True
-        else:
-            st.warning(f"Backend save failed (Status {response.status_code}): {response.text}. Saving locally.")
-            return False
-    except requests.exceptions.ConnectionError as e:
-        st.warning(f"Could not connect to backend: {e}. Saving locally.")
-        return False
+# Pre-resized PNG bytes, decoded once per process (missing icons are None)
+icons = load_icons()
+water_icon = icons["water"]
+read_icon = icons["reading"]
+meditate_icon = icons["meditation"]
+exercise_icon = icons["exercise"]
+
 
 # --- Page UI ---
 st.set_page_config(page_title="Daily Log", page_icon="✍️")
@@ -101,6 +66,19 @@ today_str = today.strftime("%Y-%m-%d")
 
 st.info(f"Logging for: **{today_str}**")
 
+# Entries saved earlier that haven't reached the backend yet (e.g. it was offline)
+outbox = get_outbox_flusher().outbox
+pending_logs = outbox.pending()
+if pending_logs:
+    st.caption(f"⏳ {len(pending_logs)} saved log(s) waiting to sync with the backend.")
+
+# Entries the backend refused; they won't be retried
+rejected_logs = outbox.rejected()
+if rejected_logs:
+    with st.expander(f"⚠️ {len(rejected_logs)} saved log(s) were rejected by the backend"):
+        for record in rejected_logs[-5:]:
+            st.caption(f"**{record['entry']['date']}** (HTTP {record['status']}): {record['error']}")
+
 
 # --- Form ---
 with st.form("daily_log_form"):
@@ -111,7 +89,7 @@ with st.form("daily_log_form"):
         sub_col1, sub_col2 = st.columns([1, 5]) # [icon_width, checkbox_width]
         with sub_col1:
             if water_icon:
-                st.image(water_icon, width=128)
+                st.image(water_icon, width=ICON_SIZE)
             else:
                 st.write("💧") # Fallback if image not found
         with sub_col2:
@@ -121,7 +99,7 @@ with st.form("daily_log_form"):
         sub_col3, sub_col4 = st.columns([1, 5])
         with sub_col3:
             if read_icon:
-                st.image(read_icon, width=128)
+                st.image(read_icon, width=ICON_SIZE)
             else:
                 st.write("📖") # Fallback
         with sub_col4:
@@ -133,7 +111,7 @@ with st.form("daily_log_form"):
         sub_col5, sub_col6 = st.columns([1, 5])
         with sub_col5:
             if meditate_icon:
-                st.image(meditate_icon, width=128)
+                st.image(meditate_icon, width=ICON_SIZE)
             else:
                 st.write("🧘") # Fallback
         with sub_col6:
@@ -143,7 +121,7 @@ with st.form("daily_log_form"):
         sub_col7, sub_col8 = st.columns([1, 5])
         with sub_col7:
             if exercise_icon:
-                st.image(exercise_icon, width=128)
+                st.image(exercise_icon, width=ICON_SIZE)
             else:
                 st.write("🏃") # Fallback
         with sub_col8:
@@ -173,19 +151,7 @@ if submitted:
         st.warning("Please write a journal entry. The AI needs it to analyze your mood.")
     else:
         try:
-            with st.spinner("AI is analyzing your mood..."):
-                # 2. Call Backend for Mood Prediction
-                predict_payload = {"text": journal}
-                predict_response = requests.post(f"{BACKEND_URL}/predict_mood", json=predict_payload, timeout=20)
-                predict_response.raise_for_status() # Error if API fails
-                
-                prediction_data = predict_response.json()
-                predicted_mood = prediction_data.get("mood", "Neutral") # predict mood
-                
-            placeholder = st.empty()
-            placeholder.success(f"AI analyzed your mood as: **{predicted_mood}**. Saving log...")
-
-            # 3. Prepare Full Log Data
+            # 2. Prepare Full Log Data (mood is filled in below)
             log_date_str = datetime.date.today().isoformat()
             new_log_data = {
                 "date": log_date_str,
@@ -193,20 +159,33 @@ if submitted:
                 "water": 1 if water else 0,
                 "reading": 1 if reading else 0,
                 "meditation": 1 if meditation else 0,
-                "mood": predicted_mood,
                 "journal_text": journal
             }
 
-            # 4. Send to Backend /log endpoint
-            with st.spinner("Saving to backend..."):
-                log_response = requests.post(f"{BACKEND_URL}/log", json=new_log_data, timeout=10)
-                log_response.raise_for_status()
-                # Use success toast for a non-blocking final message
-                placeholder.success(f"Successfully saved log for {log_date_str}!", icon="🎉")
+            if MOOD_PREDICTION_MODE == "async":
+                # 3. Save right away; the mood is predicted in the background and patched in
+                submit_log_with_pending_mood(new_log_data)
+                st.success(
+                    f"Successfully saved log for {log_date_str}! AI is analyzing your mood in the background.",
+                    icon="🎉"
+                )
+            else:
+                with st.spinner("AI is analyzing your mood..."):
+                    # 3. Call Backend for Mood Prediction
+                    # (served from the prediction cache for re-submitted journals)
+                    with stage("predict_mood", chars=len(journal)):
+                        new_log_data["mood"] = predict_mood(get_backend_client(), get_prediction_cache(), journal) # Error if API fails
+
+                placeholder = st.empty()
+                placeholder.success(f"AI analyzed your mood as: **{new_log_data['mood']}**. Saving log...")
+
+                # 4. Queue in the local outbox; the background flusher sends it to /log
+                submit_log(new_log_data)
+                placeholder.success(f"Successfully saved log for {log_date_str}! Syncing with backend in the background.", icon="🎉")
 
         except requests.RequestException as e:
             st.error(f"**Save Failed!**\n\nCould not connect to the backend: {e}\n\n**Please try submitting again.**")
         except Exception as e:
             st.error(f"An unexpected error occurred: {e}. Please try again.")
 
-    
+render_debug_panel()
@@ -1,10 +1,13 @@
 import streamlit as st
 import requests
 import os
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+import time
 from dotenv import load_dotenv
+from utils.data import fetch_all_logs
+from utils.history import summarize_history
+from utils.insights import get_cached_insight, get_insight_cache, history_fingerprint, prompt_version, store_insight
+from utils.prefetch import prefetch_on_start
+from utils.timing import debug_toggle, render_debug_panel, stage
 
 # --- Config ---
 load_dotenv() 
@@ -23,8 +26,7 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- Backend URL ---
-BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:5000")
+# --- API Keys ---
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
 # --- LLM & Prompt Configuration ---
@@ -34,7 +36,8 @@ SUGGESTION_PROMPT_TEMPLATE = """
 You are a helpful and positive wellness coach. Your goal is to analyze a user's 
 habit log and mood history to suggest **one specific, new, and actionable habit** for them to try.
 
-Analyze the provided history (in JSON format) and look for patterns.
+Analyze the provided history (a compact summary: habit completion rates, streaks,
+weekly mood counts and recent journal entries) and look for patterns.
 - Are they missing a certain type of activity (e.g., mindfulness, physical activity)?
 - Do their journal entries or moods suggest a need (e.g., stress, low energy)?
 - Are they already very consistent with one habit? Maybe suggest a related "next step" habit.
@@ -49,24 +52,28 @@ Here is the user's history:
 {history}
 """
 
+GEMINI_MODEL = "gemini-2.5-flash"
+PROMPT_VERSION = prompt_version(SUGGESTION_PROMPT_TEMPLATE, GEMINI_MODEL) # Invalidates cached insights on prompt/model change
+
+@st.cache_resource(show_spinner=False)
+def get_suggestion_chain(api_key):
+    """
+    Builds the prompt | LLM chain once per process, on first use.
+    LangChain and the Gemini client are slow to import, so they load here instead of at page start.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain_core.prompts import ChatPromptTemplate
+
+    llm = ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        google_api_key=api_key
+    )
+    suggestion_prompt = ChatPromptTemplate.from_template(SUGGESTION_PROMPT_TEMPLATE)
+    return suggestion_prompt | llm
+
 # Check if API key is provided
 if not GEMINI_API_KEY:
     st.error("GEMINI_API_KEY is not set. Please add it to your Streamlit secrets.", icon="🚨")
-    llm = None
-    suggestion_chain = None
-else:
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=GEMINI_API_KEY
-        )
-        
-        suggestion_prompt = ChatPromptTemplate.from_template(SUGGESTION_PROMPT_TEMPLATE)
-        suggestion_chain = suggestion_prompt | llm
-    except Exception as e:
-        st.error(f"Error initializing LLM: {e}")
-        llm = None
-        suggestion_chain = None
 
 
 # --- Sidebar ---
@@ -79,13 +86,16 @@ with st.sidebar:
     st.page_link("pages/3_AI_insights.py", label="AI Insights", icon="✨")
     st.page_link("pages/0_Welcome.py", label="About", icon="👋")
 
+    debug_toggle()
+
+# Warm the dashboard in the background (once per session)
+prefetch_on_start()
+
 # --- Helper Function to Get History ---
 def get_log_history():
-    """Fetches the complete log history from the backend."""
+    """Fetches the complete log history (via the shared log cache)."""
     try:
-        response = requests.get(f"{BACKEND_URL}/get_all_logs", timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_all_logs()
         if not data:
             st.warning("Your history is empty. Please log a few days first!", icon="ℹ️")
             return None
@@ -101,38 +111,65 @@ st.markdown(
 )
 st.divider()
 
-if st.button("Analyze My History & Suggest a New Habit", type="primary", use_container_width=True, disabled=(suggestion_chain is None)):
+col_analyze, col_regenerate = st.columns([4, 1])
+with col_analyze:
+    analyze = st.button("Analyze My History & Suggest a New Habit", type="primary", use_container_width=True, disabled=(not GEMINI_API_KEY))
+with col_regenerate:
+    regenerate = st.button("🔄 Regenerate", help="Ask the AI for a fresh suggestion, even if nothing changed.", use_container_width=True, disabled=(not GEMINI_API_KEY))
+
+if analyze or regenerate:
     
-    if suggestion_chain:
+    if GEMINI_API_KEY:
         with st.spinner("AI is analyzing your history..."):
             try:
                 # 1. Get Data
-                history_data = get_log_history()
+                with stage("history"):
+                    history_data = get_log_history()
                 
                 if history_data:
-                    # 2. Convert to JSON string for the prompt
-                    history_json = json.dumps(history_data, indent=2)
-                    
-                    
-                    # 3. Stream LLM Chain response
-                    full_response = ""
-                    # Create an empty placeholder to write the stream to
+                    # 2. Summarize into a compact, token-budgeted text for the prompt
+                    with stage("summarize", rows=len(history_data)):
+                        history_summary = summarize_history(history_data)
+                    fingerprint = history_fingerprint(history_summary, PROMPT_VERSION)
+                    insight_cache = get_insight_cache()
+
+                    # Create an empty placeholder to write the result to
                     placeholder = st.empty() 
-                    
-                    # Iterate over the stream
-                    for chunk in suggestion_chain.stream({"history": history_json}):
-                        # Check if the chunk has content and append it
-                        if chunk.content:
-                            full_response += chunk.content
-                            # Update the placeholder with the new content and a "cursor"
-                            placeholder.markdown(full_response + "▌")
-                    
-                    # 4. Display final result (replacing the placeholder)
-                    placeholder.markdown(full_response)
+
+                    # 3. Reuse the last suggestion if the history hasn't changed
+                    cached = None if regenerate else get_cached_insight(insight_cache, fingerprint)
+                    if cached:
+                        placeholder.markdown(cached["text"])
+                        st.caption("No new logs since this suggestion was made. Press **Regenerate** for a fresh one.")
+                    else:
+                        # 4. Stream LLM Chain response (client is built on first use)
+                        with stage("llm_client"):
+                            suggestion_chain = get_suggestion_chain(GEMINI_API_KEY)
+                        full_response = ""
+                        
+                        with stage("llm_stream", chunks=0) as timed:
+                            stream_start = time.perf_counter()
+                            chunks = 0
+                            # Iterate over the stream
+                            for chunk in suggestion_chain.stream({"history": history_summary}):
+                                # Check if the chunk has content and append it
+                                if chunk.content:
+                                    if not chunks:
+                                        timed.set(first_chunk_ms=round((time.perf_counter() - stream_start) * 1000))
+                                    chunks += 1
+                                    full_response += chunk.content
+                                    # Update the placeholder with the new content and a "cursor"
+                                    placeholder.markdown(full_response + "▌")
+                            timed.set(chunks=chunks, chars=len(full_response))
+                        
+                        # 5. Display final result (replacing the placeholder) and remember it
+                        placeholder.markdown(full_response)
+                        if full_response:
+                            store_insight(insight_cache, fingerprint, full_response)
             
             except Exception as e:
                 st.error(f"An error occurred during analysis: {e}")
     else:
         st.error("AI Insight feature is not configured. Please check API key.", icon="🚨")
 
-
+render_debug_panel()
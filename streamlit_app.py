@@ -2,12 +2,17 @@ import streamlit as st
 import pandas as pd
 import requests
 import os
-from datetime import datetime, timedelta, date
-import calplot
-import matplotlib.pyplot as plt
-import plotly.express as px
+from datetime import datetime, date
 import time
 from dotenv import load_dotenv
+from utils.backend import get_backend_client
+from utils.assets import load_icons
+from utils.aggregates import load_dashboard_aggregates, load_offline_aggregates
+from utils.data import SAMPLE_LOGS_FILE, invalidate_logs
+from utils.charts import TREND_RANGES, render_habit_calendar, trend_frame
+from utils.mood import PENDING_MOOD, PENDING_MOOD_LABEL
+from utils.outbox import get_outbox_flusher
+from utils.timing import debug_toggle, render_debug_panel, stage
 
 load_dotenv()
 
@@ -28,11 +33,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- Backend/Data URLS ---
-BACKEND_URL = os.getenv("BACKEND_URL")
-SAMPLE_LOGS_FILE = "data/sample_logs.csv" # The fallback file
-
-
 # --- Sidebar ---
 with st.sidebar:
     st.title("🧠 MindTrack")
@@ -51,16 +51,15 @@ with st.sidebar:
     st.page_link("pages/3_AI_insights.py", label="AI Insights", icon="✨")
     st.page_link("pages/0_Welcome.py", label="About", icon="👋")
 
+    debug_toggle()
+
     if st.button("Reset to Sample Data", help="Deletes all user logs from the backend and reloads sample data.", type="secondary"):
         try:
             with st.spinner("Resetting data..."):
-                reset_url = f"{BACKEND_URL}/reset_logs"
-                response = requests.post(reset_url, timeout=10)
-                
-                response.raise_for_status() # Raise error if status is 4xx/5xx
+                get_backend_client().reset_logs() # Raises if status is 4xx/5xx
                 
                 st.success("Data reset! Reloading...")
-                st.cache_data.clear() # Clear the data cache
+                invalidate_logs(full=True) # Backend history was replaced, reload it completely
                 time.sleep(1) # Give a moment for the user to see the message
                 st.rerun() # Force a full rerun
 
@@ -73,116 +72,42 @@ with st.sidebar:
 
 # --- Helper Functions ---
 
-def calculate_streaks(active_dates_list):
-    """Calculates the current and longest streaks from a list of dates."""
-    # We must check the .size of a numpy array
-    if active_dates_list.size == 0: 
-        return 0, 0
-
-    sorted_dates = sorted(list(set(active_dates_list))) # Ensure unique and sorted
-    if not sorted_dates:
-        return 0, 0
-
-    # --- Calculate Longest Streak ---
-    longest_streak = 0
-    current_temp_streak = 1 # Start at 1 for the first date
-    
-    for i in range(1, len(sorted_dates)):
-        if sorted_dates[i] == sorted_dates[i-1] + timedelta(days=1):
-            # Streak continues
-            current_temp_streak += 1
-        else:
-            # Streak broken, update longest if needed
-            if current_temp_streak > longest_streak:
-                longest_streak = current_temp_streak
-            current_temp_streak = 1 # Reset for the new date
-            
-    # Final check after loop
-    if current_temp_streak > longest_streak:
-        longest_streak = current_temp_streak
-
-    # --- Calculate Current Streak ---
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    
-    current_streak = 0
-    
-    if today in sorted_dates:
-        current_streak = 1
-        temp_date = yesterday
-        while temp_date in sorted_dates:
-            current_streak += 1
-            temp_date -= timedelta(days=1)
-            
-    elif yesterday in sorted_dates:
-        # Today not logged, but yesterday was
-        current_streak = 1
-        temp_date = yesterday - timedelta(days=1)
-        while temp_date in sorted_dates:
-            current_streak += 1
-            temp_date -= timedelta(days=1)
-    
-    # If neither today nor yesterday is logged, current_streak remains 0
-       
-    return current_streak, longest_streak
-
-
-
 def load_data():
     """
-    Tries to load all logs from the backend.
-    If it fails, falls back to local sample_logs.csv for demo.
+    Tries to load the dashboard aggregates of all logs from the backend.
+    If it fails, falls back to the local on-disk copy (or sample_logs.csv for demo).
+    Returns None if no data could be loaded.
     """
     try:
-        # 1. Try to fetch live data from the backend
-        response = requests.get(f"{BACKEND_URL}/get_all_logs", timeout=5)
-        response.raise_for_status() # Raise an error if the request failed
-        
-        data = response.json()
+        # 1. Try live data (local copy synced with the backend, aggregated once per change)
+        aggregates = load_dashboard_aggregates()
 
-        print(f"DATA FROm BACKEND : {data}")
-        
-        if not data:
+        if aggregates.days_logged == 0:
             st.toast("No logs found in backend. Loading samples.", icon="ℹ️")
             raise requests.exceptions.RequestException("Empty data")
             
-        logs_df = pd.DataFrame(data)
         st.toast("Loaded live data from backend!", icon="✅")
+        return aggregates
         
     except requests.exceptions.RequestException as e:
-        # 2. Fallback to local sample data
-        st.toast(f"Backend not reachable: {e}. Loading local sample data for demo.", icon="⚠️")
+        # 2. Fallback to the local on-disk copy
         try:
-            logs_df = pd.read_csv(SAMPLE_LOGS_FILE)
+            aggregates, source = load_offline_aggregates()
+            st.toast(f"Backend not reachable: {e}. Showing {source}.", icon="⚠️")
+            return aggregates
         except FileNotFoundError:
             st.error(f"Sample file not found at {SAMPLE_LOGS_FILE}. Cannot display data.")
-            return pd.DataFrame(), 0, 0
-    
-    # 3. Process data (This happens for both live and sample data)
-    try:
-        # Keep as full datetime objects for calplot
-        logs_df['date'] = pd.to_datetime(logs_df['date']) 
-        logs_df = logs_df.drop_duplicates(subset=['date'], keep='last').sort_values(by='date')
-        
-        # Calculate total_habits for each day
-        habits = ["water", "reading", "meditation", "exercise"]
-        available_habits = [h for h in habits if h in logs_df.columns]
-        
-        for habit in available_habits:
-             logs_df[habit] = pd.to_numeric(logs_df[habit], errors='coerce').fillna(0)
-        logs_df['total_habits'] = logs_df[available_habits].sum(axis=1)
-
-        # Get active dates for streak calculation (as date objects)
-        active_dates_as_date = logs_df['date'].dt.date.unique()
-        current_s, longest_s = calculate_streaks(active_dates_as_date)
-        
-        return logs_df, current_s, longest_s # Return DF with full datetime
+            return None
     except Exception as e:
         st.error(f"Error processing data: {e}")
-        return pd.DataFrame(), 0, 0
+        return None
 
 # --- Load Data ---
-logs_df, current_streak, longest_streak = load_data()
+get_outbox_flusher() # Starts replaying any log submissions still in the local outbox
+with stage("load_data"):
+    aggregates = load_data()
+current_streak = aggregates.streaks.current if aggregates else 0
+longest_streak = aggregates.streaks.longest if aggregates else 0
 
 APP_URL = os.getenv("APP_URL") 
 
@@ -278,13 +203,16 @@ if st.session_state.get("show_reward_dialogue", False):
 # --- Main Page ---
 st.title("📊 Progress Dashboard")
 
-if logs_df.empty:
+if aggregates is None:
     st.info("No data to display. Start by adding an entry in the 'Daily Log' page!")
 else:
+    # Deferred so the page (metrics, quote) starts rendering before Plotly is loaded
+    import plotly.express as px
+
     # --- Key Metrics ---
     st.subheader("Your Streaks")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Days Logged", f"{len(logs_df)}")
+    col1.metric("Total Days Logged", f"{aggregates.days_logged}")
     col2.metric("Current Streak", f"{current_streak} 🔥")
     col3.metric("Longest Streak", f"{longest_streak} 🏆")
 
@@ -294,34 +222,25 @@ else:
     st.subheader("Habit Calendar")
     
     try:
-        # Data is already prepared with 'total_habits' and DatetimeIndex in load_data
-        heatmap_data = logs_df.set_index('date')['total_habits'].astype(float)
-        
-        max_habits = 4 # Assuming 4 habits
+        heatmap_data = aggregates.daily_totals
+        max_habits = aggregates.max_habits
+
+        # Only render the selected years (latest year by default)
+        available_years = sorted(int(y) for y in heatmap_data.index.year.unique())
+        if len(available_years) > 1:
+            first_year, last_year = st.select_slider(
+                "Years to show",
+                options=available_years,
+                value=(available_years[-1], available_years[-1]),
+            )
+        else:
+            first_year = last_year = available_years[0]
+        years = tuple(y for y in available_years if first_year <= y <= last_year)
 
-        plt.style.use('dark_background')
-        
-        # Clear any existing plots from matplotlib's state
-        plt.clf()
-
-        # Let calplot create its own figure and axes
-        calplot.calplot(
-            heatmap_data,
-            cmap='YlGn',
-            edgecolor='black',
-            fillcolor='gray',
-            linewidth=0.5,
-            yearlabels=True,
-            yearascending=True,
-            figsize=(12, 5),
-            textformat='{:.0f}',
-            vmin=0,
-            vmax=4,
-            colorbar=False
-        )
-        
-        # Using st.pyplot(plt.gcf()) to grab the current figure
-        st.pyplot(plt.gcf()) 
+        # Rendered once per (data, years) and shared across reruns and sessions
+        with stage("calendar", years=len(years)):
+            calendar_png = render_habit_calendar(aggregates.daily_fingerprint, heatmap_data, years)
+        st.image(calendar_png, use_container_width=True)
         
         st.caption(f"Color intensity shows total habits completed (0 to {max_habits}).")
 
@@ -333,16 +252,29 @@ else:
     # --- Daily Progress Trend (Line Chart) ---
     st.subheader("Daily Progress Trend")
     try:
-        fig_line = px.line(
-            logs_df.sort_values(by='date'),
-            x='date',
-            y='total_habits',
-            title="Total Habits Completed Over Time",
-            markers=True,
-            template='plotly_dark' # Using dark theme
-        )
-        fig_line.update_layout(xaxis_title="Date", yaxis_title="Habits Completed")
-        st.plotly_chart(fig_line, use_container_width=True)
+        trend_range = st.radio("Range", list(TREND_RANGES), index=len(TREND_RANGES) - 1, horizontal=True)
+
+        # Long ranges are resampled so the chart payload stays small
+        with stage("trend") as timed:
+            trend_df, resolution = trend_frame(
+                aggregates.daily_fingerprint, aggregates.daily_totals, TREND_RANGES[trend_range]
+            )
+            timed.set(points=len(trend_df), resolution=resolution)
+            fig_line = px.line(
+                trend_df,
+                x='date',
+                y=['total_habits', 'rolling_avg'],
+                title="Total Habits Completed Over Time",
+                markers=(resolution == "daily"),
+                template='plotly_dark' # Using dark theme
+            )
+            fig_line.update_layout(xaxis_title="Date", yaxis_title="Habits Completed", legend_title=None)
+            fig_line.for_each_trace(lambda t: t.update(name={
+                'total_habits': "Habits completed" if resolution == "daily" else f"{resolution.title()} average",
+                'rolling_avg': "Rolling average",
+            }[t.name]))
+        with stage("plotly_chart", chart="trend"): # Figure serialization happens here
+            st.plotly_chart(fig_line, use_container_width=True)
     except Exception as e:
         st.error(f"Error generating trend line: {e}")
 
@@ -357,13 +289,7 @@ else:
     with c1:
         # 1. Habit Completion Rate (Bar Chart)
         st.markdown("##### Habit Completion Rate")
-        habits = ['exercise', 'water', 'reading', 'meditation']
-        # Filter for habits that actually exist
-        available_habits = [h for h in habits if h in logs_df.columns]
-        
-        habit_counts = logs_df[available_habits].sum()
-        habit_df = habit_counts.reset_index()
-        habit_df.columns = ['Habit', 'Days Completed']
+        habit_df = pd.DataFrame(aggregates.habit_counts, columns=['Habit', 'Days Completed'])
         
         fig_bar = px.bar(
             habit_df, 
@@ -374,13 +300,15 @@ else:
             title="Total Times Each Habit Was Completed"
         )
         fig_bar.update_layout(showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        with stage("plotly_chart", chart="habits"):
+            st.plotly_chart(fig_bar, use_container_width=True)
         
     with c2:
         # 2. Mood Distribution (Pie Chart)
         st.markdown("##### AI Logged Mood Distribution")
-        mood_counts = logs_df['mood'].value_counts().reset_index()
-        mood_counts.columns = ['Mood', 'Count']
+        # Rows whose mood is still being predicted show up as "Analyzing…"
+        mood_counts = pd.DataFrame(aggregates.mood_counts, columns=['Mood', 'Count'])
+        mood_counts['Mood'] = mood_counts['Mood'].replace(PENDING_MOOD, PENDING_MOOD_LABEL)
         
         fig_pie = px.pie(
             mood_counts, 
@@ -390,5 +318,14 @@ else:
             title="Moods Recorded by AI Analysis",
             hole=0.3
         )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with stage("plotly_chart", chart="moods"):
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        if aggregates.pending_moods:
+            st.caption(f"{PENDING_MOOD_LABEL} {aggregates.pending_moods} recent log(s) are still being analyzed by the AI.")
+
+render_debug_panel()
 
+# --- Warm static assets ---
+# After the dashboard is drawn, so the Daily Log page finds its icons ready
+load_icons()
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Make `utils` importable the same way Streamlit does (project root on sys.path)
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def run_from_project_root(monkeypatch):
+    """The app resolves data/ and assets/ relative to the project root."""
+    monkeypatch.chdir(ROOT)
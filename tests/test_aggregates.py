@@ -0,0 +1,70 @@
+from datetime import date
+
+import pandas as pd
+
+from utils import aggregates
+from utils.aggregates import compute_aggregates, load_offline_aggregates
+from utils.data import SAMPLE_LOGS_FILE
+from utils.localstore import LocalLogStore
+from utils.mood import PENDING_MOOD
+from utils.schema import empty_compact, to_compact
+
+
+def _logs():
+    return pd.DataFrame([
+        {"date": "2025-10-08", "exercise": "1", "water": 1, "reading": 0, "meditation": 1, "mood": "Happy"},
+        {"date": "2025-10-06", "exercise": 0, "water": 1, "reading": None, "meditation": 0, "mood": "Sad"},
+        {"date": "2025-10-07", "exercise": 1, "water": 0, "reading": 1, "meditation": 0, "mood": "Sad"},
+        {"date": "2025-10-08", "exercise": 1, "water": 1, "reading": 1, "meditation": 1, "mood": PENDING_MOOD},
+        {"date": "garbage", "exercise": 1, "water": 1, "reading": 1, "meditation": 1, "mood": "Happy"},
+    ])
+
+
+def test_single_pass_aggregates():
+    agg = compute_aggregates(to_compact(_logs())[0])
+
+    assert agg.days_logged == 3
+    assert agg.max_habits == 4
+    assert list(agg.daily_totals.index.date) == [date(2025, 10, 6), date(2025, 10, 7), date(2025, 10, 8)]
+    assert agg.daily_totals.tolist() == [1.0, 2.0, 4.0] # last entry for 10-08 wins
+    assert dict(agg.habit_counts) == {"exercise": 2.0, "water": 2.0, "reading": 2.0, "meditation": 1.0}
+    assert dict(agg.mood_counts) == {"Sad": 2, PENDING_MOOD: 1}
+    assert agg.pending_moods == 1
+    assert agg.streaks.longest == 3
+
+
+def test_matches_sample_data_totals():
+    sample = pd.read_csv(SAMPLE_LOGS_FILE)
+    agg = compute_aggregates(to_compact(sample)[0])
+    habits = ["exercise", "water", "reading", "meditation"]
+
+    assert agg.days_logged == len(sample)
+    assert dict(agg.habit_counts) == sample[habits].sum().astype(float).to_dict()
+    assert dict(agg.mood_counts) == sample["mood"].value_counts().to_dict()
+
+
+def test_empty_logs():
+    agg = compute_aggregates(empty_compact())
+
+    assert agg.days_logged == 0
+    assert agg.habit_counts == ()
+    assert agg.streaks.longest == 0
+
+
+def test_offline_aggregates_follow_mirror_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregates, "MIRROR_DIR", str(tmp_path))
+    aggregates._local_aggregates.clear()
+    mirror = LocalLogStore(str(tmp_path))
+
+    # Empty mirror: sample data, but not for good
+    mirror.replace(empty_compact())
+    assert load_offline_aggregates()[1] == "local sample data"
+
+    mirror.replace(*to_compact([{"date": "2025-10-06", "water": 1, "mood": "Happy"}]))
+    agg, source = load_offline_aggregates()
+    assert (agg.days_logged, source) == (1, "your last synced data")
+
+    mirror.append(*to_compact([{"date": "2025-10-07", "water": 1, "reading": 1, "mood": "Sad"}]))
+    agg, _ = load_offline_aggregates()
+    assert agg.days_logged == 2
+    assert agg.daily_totals.tolist() == [1, 2]
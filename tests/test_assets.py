@@ -0,0 +1,25 @@
+import io
+
+from PIL import Image
+
+from utils import assets
+
+
+def test_icons_are_resized_to_display_size():
+    data = assets.load_icon.__wrapped__("assets/icons/water.png")
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "PNG"
+        assert image.size == (assets.ICON_SIZE, assets.ICON_SIZE)
+    assert len(data) < 28350 # Smaller than the 512 px source
+
+
+def test_missing_icon_is_none():
+    assert assets.load_icon.__wrapped__("assets/icons/missing.png") is None
+
+
+def test_load_icons_covers_every_habit():
+    icons = assets.load_icons()
+    assert set(icons) == set(assets.ICON_NAMES)
+    assert all(icons.values())
+    assert assets.load_icons()["water"] is icons["water"] # Shared, not re-decoded
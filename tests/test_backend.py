@@ -0,0 +1,235 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+
+from utils.backend import BackendClient, BackendUnavailable, CircuitBreaker, SingleFlight
+
+
+def _response(status=200, payload=None):
+    response = mock.Mock(status_code=status)
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(str(status))
+    return response
+
+
+def _client(session, threshold=2, cooldown=30):
+    return BackendClient("http://backend/", session=session, breaker=CircuitBreaker(threshold, cooldown))
+
+
+def test_uses_shared_session_and_endpoint_timeouts():
+    session = mock.Mock()
+    session.request.return_value = _response(payload={"mood": "Happy"})
+    client = _client(session)
+
+    assert client.predict_mood("great day") == "Happy"
+    session.request.assert_called_once_with(
+        "POST", "http://backend/predict_mood", timeout=20, json={"text": "great day"}
+    )
+
+    client.get_all_logs(since="2025-10-01")
+    assert session.request.call_args.kwargs == {"timeout": 5, "params": {"since": "2025-10-01"}}
+
+
+def test_missing_url_fails_fast():
+    session = mock.Mock()
+    with pytest.raises(BackendUnavailable):
+        BackendClient(None, session=session).get_all_logs()
+    session.request.assert_not_called()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    session = mock.Mock()
+    session.request.side_effect = requests.exceptions.ConnectionError("refused")
+    client = _client(session, threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get_all_logs()
+    with pytest.raises(BackendUnavailable):
+        client.get_all_logs()
+
+    assert session.request.call_count == 2
+    assert client.breaker.is_open
+
+
+def test_server_errors_count_but_client_errors_do_not():
+    session = mock.Mock()
+    client = _client(session, threshold=2)
+
+    session.request.return_value = _response(404)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_all_logs()
+    assert not client.breaker.is_open
+
+    session.request.return_value = _response(503)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_all_logs()
+    assert client.breaker.is_open
+
+
+def test_breaker_lets_one_trial_through_under_concurrency():
+    breaker = CircuitBreaker(threshold=1, cooldown=10)
+    with mock.patch("utils.backend.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+
+    def race():
+        start = threading.Barrier(8)
+
+        def call():
+            start.wait()
+            return breaker.allow()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            return [f.result() for f in [pool.submit(call) for _ in range(8)]]
+
+    with mock.patch("utils.backend.time.monotonic", return_value=111.0):
+        assert sorted(race()) == [False] * 7 + [True]
+        assert breaker.is_open # Until the trial reports back
+        breaker.record_failure() # Trial failed: open for another cooldown
+        assert race() == [False] * 8
+    with mock.patch("utils.backend.time.monotonic", return_value=122.0):
+        assert race().count(True) == 1
+        breaker.record_success()
+        assert race() == [True] * 8
+        assert not breaker.is_open
+
+
+def test_breaker_half_opens_after_cooldown():
+    breaker = CircuitBreaker(threshold=1, cooldown=10)
+    with mock.patch("utils.backend.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+        assert not breaker.allow()
+    with mock.patch("utils.backend.time.monotonic", return_value=111.0):
+        assert breaker.allow()
+        breaker.record_failure() # trial failed: open again
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+
+def _run_concurrently(n, fn):
+    results, errors = [None] * n, [None] * n
+
+    def call(i):
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return ["log"]
+
+    threads, results, errors = _run_concurrently(5, lambda: flight.do("logs", fetch))
+    # Every caller is either running the fetch or waiting on it before it finishes
+    deadline = time.monotonic() + 5
+    while flight._calls.get("logs") is None or flight._calls["logs"].waiters < 4:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert errors == [None] * 5
+    assert all(r is results[0] for r in results)
+
+    # Not a cache: the next call goes to the backend again
+    assert flight.do("logs", lambda: "fresh") == "fresh"
+
+
+def test_single_flight_fans_out_errors_and_keeps_keys_apart():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise requests.exceptions.ConnectionError("down")
+
+    threads, results, errors = _run_concurrently(3, lambda: flight.do("logs", failing))
+    deadline = time.monotonic() + 5
+    while flight._calls.get("logs") is None or flight._calls["logs"].waiters < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    assert flight.do("other", lambda: "independent") == "independent"
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert all(isinstance(e, requests.exceptions.ConnectionError) for e in errors)
+    assert flight._calls == {}
+
+
+def test_concurrent_get_all_logs_share_one_request():
+    release = threading.Event()
+    session = mock.Mock()
+
+    def request(*args, **kwargs):
+        release.wait(5)
+        return _response(payload=[{"date": "2025-10-06"}])
+    session.request.side_effect = request
+    client = _client(session)
+
+    threads, results, errors = _run_concurrently(4, client.get_all_logs)
+    deadline = time.monotonic() + 5
+    while not client._inflight._calls or next(iter(client._inflight._calls.values())).waiters < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert session.request.call_count == 1
+    assert results == [[{"date": "2025-10-06"}]] * 4
+    client.get_all_logs(since="2025-10-06") # A different query is its own request
+    assert session.request.call_count == 2
+
+
+def test_stream_logs_parses_chunks_into_the_compact_schema():
+    body = json.dumps([{"date": "2025-10-06", "water": 1, "mood": "Happy", "journal_text": "ok"}]).encode()
+    response = _response()
+    response.iter_content.return_value = [body[:7], body[7:]]
+    response.__enter__ = mock.Mock(return_value=response)
+    response.__exit__ = mock.Mock(return_value=False)
+    session = mock.Mock()
+    session.request.return_value = response
+
+    frame, journals = _client(session).stream_logs(journals=False)
+
+    assert frame["day"].tolist() == [20367] and journals == {}
+    assert session.request.call_args.kwargs == {"timeout": 5, "params": None, "stream": True}
+    response.__exit__.assert_called_once() # Connection released back to the pool
+
+
+def test_stream_logs_reports_bad_payloads_as_request_errors():
+    response = _response()
+    response.iter_content.return_value = [b"<html>502</html>"]
+    response.__enter__ = mock.Mock(return_value=response)
+    response.__exit__ = mock.Mock(return_value=False)
+    session = mock.Mock()
+    session.request.return_value = response
+
+    with pytest.raises(requests.exceptions.RequestException):
+        _client(session).stream_logs()
@@ -0,0 +1,26 @@
+from utils.cache import PersistentLRUCache
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"), max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a") # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.json")
+    PersistentLRUCache(path).put("key", {"mood": "Happy"})
+
+    assert PersistentLRUCache(path).get("key") == {"mood": "Happy"}
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+
+    assert len(PersistentLRUCache(str(path))) == 0
@@ -0,0 +1,65 @@
+from unittest import mock
+
+import calplot
+import pandas as pd
+
+from utils import charts
+
+
+def _habits(start="2024-12-20", periods=30, value=2.0):
+    index = pd.date_range(start, periods=periods, freq="D")
+    return pd.Series(value, index=index)
+
+
+def test_fingerprint_tracks_content():
+    assert charts.series_fingerprint(_habits()) == charts.series_fingerprint(_habits())
+    assert charts.series_fingerprint(_habits()) != charts.series_fingerprint(_habits(value=3.0))
+
+
+def test_render_returns_png_and_only_selected_years():
+    data = _habits()
+    with mock.patch.object(calplot, "yearplot", wraps=calplot.yearplot) as yearplot:
+        png = charts.render_habit_calendar(charts.series_fingerprint(data), data, (2025,))
+
+    assert png.startswith(b"\x89PNG")
+    assert [call.kwargs["year"] for call in yearplot.call_args_list] == [2025]
+
+
+def test_render_is_cached_on_fingerprint():
+    data = _habits(start="2023-03-01")
+    key = charts.series_fingerprint(data)
+    first = charts.render_habit_calendar(key, data, (2023,))
+    with mock.patch.object(calplot, "yearplot") as yearplot:
+        second = charts.render_habit_calendar(key, data, (2023,))
+
+    yearplot.assert_not_called()
+    assert second == first
+
+
+def test_render_svg():
+    data = _habits()
+    svg = charts.render_habit_calendar(charts.series_fingerprint(data), data, (2024, 2025), fmt="svg")
+    assert b"<svg" in svg
+
+
+def test_trend_frame_keeps_short_history_daily():
+    data = _habits(periods=60)
+    frame, resolution = charts.trend_frame(charts.series_fingerprint(data), data, days=30)
+
+    assert resolution == "daily"
+    assert len(frame) == 30
+    assert list(frame.columns) == ["date", "total_habits", "rolling_avg"]
+
+
+def test_trend_frame_resamples_long_history():
+    data = _habits(start="2005-01-01", periods=20 * 365)
+    key = charts.series_fingerprint(data)
+
+    weekly, weekly_res = charts.trend_frame(key, data, days=365)
+    three_years, three_years_res = charts.trend_frame(key, data, days=3 * 365)
+    everything, everything_res = charts.trend_frame(key, data, days=None)
+
+    assert weekly_res == "weekly" and len(weekly) <= charts.TREND_MAX_POINTS
+    assert three_years_res == "monthly" and len(three_years) <= charts.TREND_MAX_POINTS
+    assert everything_res == "quarterly" and len(everything) <= charts.TREND_MAX_POINTS
+    assert everything["total_habits"].eq(2.0).all()
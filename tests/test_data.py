@@ -0,0 +1,215 @@
+from unittest import mock
+
+import pytest
+
+from utils import data
+
+
+def _log(date, **fields):
+    return {"date": date, "water": 1, "mood": "Happy", "journal_text": "ok", **fields}
+
+
+class FakeBackend:
+    """Serves /get_all_logs from a list, honouring `since` unless told otherwise."""
+
+    def __init__(self, logs, supports_since=True):
+        self.logs = list(logs)
+        self.supports_since = supports_since
+        self.calls = []
+
+    def get_all_logs(self, since=None):
+        self.calls.append(since)
+        if since and self.supports_since:
+            return [log for log in self.logs if log["date"] >= since]
+        return list(self.logs)
+
+
+def _dates(records):
+    return [r["date"] for r in records]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(data, "LOGS_CACHE_TTL", 300)
+    return data.LogStore()
+
+
+def test_full_reload_then_served_from_cache(store):
+    backend = FakeBackend([_log("2025-10-07"), _log("2025-10-06")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        first = store.records()
+        second = store.records()
+
+    assert _dates(first) == ["2025-10-06", "2025-10-07"]
+    assert second == first
+    assert backend.calls == [None]
+
+
+def test_delta_sync_merges_new_and_updated_rows(store):
+    backend = FakeBackend([_log("2025-10-06"), _log("2025-10-07", mood="Sad")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+        backend.logs += [_log("2025-10-07", mood="Happy"), _log("2025-10-08")]
+        store.invalidate()
+        records = store.records()
+
+    assert backend.calls == [None, "2025-10-07"]
+    assert _dates(records) == ["2025-10-06", "2025-10-07", "2025-10-08"]
+    assert records[1]["mood"] == "Happy"
+
+
+def test_backend_ignoring_since_replaces_copy(store):
+    backend = FakeBackend([_log("2025-10-06"), _log("2025-10-07")], supports_since=False)
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+        backend.logs = [_log("2025-10-06"), _log("2025-10-08")] # 10-07 deleted upstream
+        store.invalidate()
+        records = store.records()
+
+    assert _dates(records) == ["2025-10-06", "2025-10-08"]
+
+
+def test_invalidate_full_forces_complete_reload(store):
+    backend = FakeBackend([_log("2025-10-06"), _log("2025-10-07")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+        backend.logs = [_log("2025-10-01")] # history reset
+        store.invalidate(full=True)
+        records = store.records()
+
+    assert backend.calls == [None, None]
+    assert _dates(records) == ["2025-10-01"]
+
+
+def test_invalid_dates_are_dropped(store):
+    backend = FakeBackend([_log("2025-10-06"), _log("not a date")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        records = store.records()
+
+    assert _dates(records) == ["2025-10-06"]
+
+
+def test_records_keep_backend_shape(store):
+    backend = FakeBackend([_log("2025-10-06"), {"date": "2025-10-07", "water": 0}])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        records = store.records()
+
+    assert records[0] == {
+        "date": "2025-10-06", "water": 1, "reading": 0, "meditation": 0, "exercise": 0,
+        "mood": "Happy", "journal_text": "ok",
+    }
+    assert records[1]["mood"] is None
+    assert records[1]["journal_text"] is None
+
+
+def test_failed_delta_sync_serves_local_copy_and_backs_off(store):
+    backend = FakeBackend([_log("2025-10-06")])
+    failing = mock.Mock(spec=["get_all_logs"])
+    failing.get_all_logs.side_effect = data.requests.exceptions.ConnectionError("down")
+
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+    store.invalidate()
+    with mock.patch.object(data, "get_backend_client", return_value=failing):
+        assert _dates(store.records()) == ["2025-10-06"]
+        store.frame() # within the back-off window: no new attempt
+
+    assert failing.get_all_logs.call_count == 1
+
+
+def test_failed_first_load_raises(store):
+    failing = mock.Mock(spec=["get_all_logs"])
+    failing.get_all_logs.side_effect = data.requests.exceptions.ConnectionError("down")
+    with mock.patch.object(data, "get_backend_client", return_value=failing):
+        with pytest.raises(data.requests.exceptions.RequestException):
+            store.frame()
+
+
+def test_derived_values_are_computed_once_per_data_version(store):
+    backend = FakeBackend([_log("2025-10-06")])
+    compute = mock.Mock(side_effect=lambda frame: len(frame))
+
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        assert store.derived("count", compute) == 1
+        assert store.derived("count", compute) == 1
+        store.invalidate() # delta sync with no changes keeps the version
+        assert store.derived("count", compute) == 1
+        backend.logs.append(_log("2025-10-07"))
+        store.invalidate()
+        assert store.derived("count", compute) == 2
+
+    assert compute.call_count == 2
+
+
+def test_frame_is_compact_and_journals_are_separate(store):
+    backend = FakeBackend([_log("2025-10-06", exercise=1)])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        frame = store.frame()
+
+    assert list(frame.columns) == ["day", "habits", "mood"]
+    assert str(frame["habits"].dtype) == "uint8" and str(frame["mood"].dtype) == "category"
+    assert frame["habits"].iat[0] == 0b1001 # water + exercise
+    assert store.journals.get(int(frame["day"].iat[0])) == "ok"
+
+
+def test_changes_are_mirrored_to_disk(tmp_path, monkeypatch):
+    from utils.localstore import LocalLogStore
+
+    monkeypatch.setattr(data, "LOGS_CACHE_TTL", 300)
+    mirror = LocalLogStore(str(tmp_path))
+    store = data.LogStore(mirror=mirror)
+    backend = FakeBackend([_log("2025-10-06")])
+
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+        backend.logs.append(_log("2025-10-07", mood="Sad"))
+        store.invalidate()
+        frame = store.frame()
+
+    assert mirror.load().equals(frame)
+    assert len(mirror.journals()) == 2
+
+
+def test_periodic_full_reload_picks_up_edits_to_older_days(store, monkeypatch):
+    backend = FakeBackend([_log("2025-10-06"), _log("2025-10-07")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame()
+        backend.logs[0] = _log("2025-10-06", mood="Sad") # e.g. re-scored
+        store.invalidate()
+        assert store.records()[0]["mood"] == "Happy" # A delta sync can't see it
+
+        monkeypatch.setattr(data, "LOGS_FULL_RELOAD_TTL", 0)
+        store.invalidate()
+        records = store.records()
+
+    assert backend.calls == [None, "2025-10-07", None]
+    assert records[0]["mood"] == "Sad"
+
+
+class StreamingBackend(FakeBackend):
+    """A FakeBackend that also offers stream_logs, honouring `journals`."""
+
+    def __init__(self, logs):
+        super().__init__(logs)
+        self.stream_calls = []
+
+    def stream_logs(self, since=None, journals=True):
+        self.stream_calls.append((since, journals))
+        frame, texts = data.to_compact(FakeBackend.get_all_logs(self, since))
+        return frame, texts if journals else {}
+
+
+def test_streaming_client_defers_journals_until_records_are_needed(store):
+    backend = StreamingBackend([_log("2025-10-06", journal_text="first")])
+    with mock.patch.object(data, "get_backend_client", return_value=backend):
+        store.frame() # Dashboard: no journal texts
+        assert store.journals.snapshot() == {}
+
+        records = store.records() # AI Insights: reload once with journals
+        backend.logs.append(_log("2025-10-07", journal_text="second"))
+        store.invalidate()
+        later = store.records()
+
+    assert backend.stream_calls == [(None, False), (None, True), ("2025-10-06", True)]
+    assert [r["journal_text"] for r in records] == ["first"]
+    assert [r["journal_text"] for r in later] == ["first", "second"]
@@ -0,0 +1,79 @@
+import csv
+import os
+
+import pytest
+
+from utils import data
+from utils.backend import BackendUnavailable
+from utils.embedded import EmbeddedBackend
+
+
+with open(os.path.join(os.path.dirname(__file__), "..", data.SAMPLE_LOGS_FILE), newline="") as f:
+    SAMPLE_ROWS = sum(1 for _ in csv.DictReader(f))
+
+
+def _log(date, **fields):
+    return {"date": date, "exercise": 0, "water": 1, "reading": 0, "meditation": 0,
+            "mood": "Happy", "journal_text": "ok", **fields}
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = EmbeddedBackend(str(tmp_path / "mindtrack.db"))
+    yield backend
+    backend.close()
+
+
+def test_new_database_is_seeded_with_the_sample_logs(backend):
+    logs = backend.get_all_logs()
+
+    assert len(logs) == SAMPLE_ROWS
+    assert [log["date"] for log in logs] == sorted(log["date"] for log in logs)
+    assert logs[0] == {
+        "date": "2025-10-06", "exercise": 1, "water": 0, "reading": 0, "meditation": 0,
+        "mood": "Sad", "journal_text": "Low energy today, couldn't exercise much.",
+    }
+
+
+def test_save_log_upserts_by_date_and_since_filters(backend):
+    backend.reset_logs()
+    backend.save_log(_log("2030-01-02", mood="Sad"))
+    backend.save_log(_log("2030-01-01"))
+    backend.save_log(_log("2030-01-02", mood="Happy", exercise="1", water=False))
+
+    assert backend.get_all_logs(since="2030-01-02") == [
+        _log("2030-01-02", mood="Happy", exercise=1, water=0)
+    ]
+    assert len(backend.get_all_logs()) == SAMPLE_ROWS + 2
+
+
+def test_reset_reseeds_and_data_survives_reopening(tmp_path):
+    path = str(tmp_path / "mindtrack.db")
+    backend = EmbeddedBackend(path)
+    backend.save_logs([_log("2030-01-01"), _log("2030-01-02")])
+    backend.close()
+
+    reopened = EmbeddedBackend(path)
+    assert len(reopened.get_all_logs()) == SAMPLE_ROWS + 2 # Not re-seeded on top
+    reopened.reset_logs()
+    assert len(reopened.get_all_logs()) == SAMPLE_ROWS
+    reopened.close()
+
+
+def test_storage_errors_look_like_an_unreachable_backend(backend):
+    backend.close()
+    with pytest.raises(BackendUnavailable):
+        backend.get_all_logs()
+
+
+def test_log_store_syncs_incrementally_from_the_embedded_backend(backend, monkeypatch):
+    monkeypatch.setattr(data, "LOGS_CACHE_TTL", 300)
+    store = data.LogStore(client=backend)
+    assert len(store.frame()) == SAMPLE_ROWS
+
+    backend.save_log(_log("2030-01-01"))
+    store.invalidate()
+    records = store.records()
+
+    assert len(records) == SAMPLE_ROWS + 1
+    assert records[-1]["date"] == "2030-01-01"
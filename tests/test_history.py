@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from utils.history import estimate_tokens, summarize_history
+
+
+def _history(days, journal_words=40, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end="2025-10-26", periods=days, freq="D").strftime("%Y-%m-%d")
+    moods = rng.choice(["Happy", "Neutral", "Sad", "Angry"], size=days)
+    return [
+        {
+            "date": d,
+            "water": int(rng.random() < 0.6),
+            "reading": int(rng.random() < 0.3),
+            "meditation": int(rng.random() < 0.7),
+            "exercise": int(rng.random() < 0.5),
+            "mood": m,
+            "journal_text": " ".join(["word"] * journal_words),
+        }
+        for d, m in zip(dates, moods)
+    ]
+
+
+def test_summary_has_all_sections():
+    summary = summarize_history(_history(60))
+
+    assert summary.startswith("Logged days: 60 (2025-08-28 to 2025-10-26)")
+    assert "- meditation:" in summary
+    assert "Streaks: current" in summary
+    assert "week,Angry,Happy,Neutral,Sad" in summary
+    assert "2025-10-26 | " in summary
+
+
+def test_summary_stays_within_budget_for_long_histories():
+    short = summarize_history(_history(30), token_budget=800)
+    long = summarize_history(_history(20 * 365), token_budget=800)
+
+    assert estimate_tokens(long) <= 800
+    assert estimate_tokens(short) <= 800
+    # Most recent journal entry always makes it in
+    assert "2025-10-26 | " in long
+
+
+def test_handles_missing_fields_and_empty_history():
+    assert summarize_history([]) == "No logs yet."
+
+    summary = summarize_history([{"date": "2025-10-26", "water": 1, "mood": None, "journal_text": None}])
+    assert "Logged days: 1" in summary
+    assert "Recent journal entries" not in summary
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from utils.ingest import iter_json_array, stream_compact
+from utils.schema import to_compact
+
+LOGS = [
+    {"date": "2025-10-06", "water": 1, "exercise": "1", "mood": "Happy", "journal_text": "Café ☕ and a long walk"},
+    {"date": "2025-10-07", "water": 0, "reading": True, "mood": None, "journal_text": None},
+    {"date": "not a date", "water": 1},
+    {"date": "2025-10-06T08:00:00", "meditation": 1.0, "mood": "Ångry", "journal_text": ""}, # Replaces the 6th
+    {"date": "10/12/2025", "exercise": "yes", "mood": "Sad", "journal_text": "Rainy"},
+]
+
+
+def _chunks(body, size):
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 64, 1 << 20])
+def test_stream_matches_to_compact_for_any_chunking(size):
+    body = json.dumps(LOGS, ensure_ascii=False).encode() # Multi-byte characters get split at size 1-5
+
+    frame, journals = stream_compact(_chunks(body, size))
+    expected_frame, expected_journals = to_compact(LOGS)
+
+    assert frame.equals(expected_frame)
+    assert list(frame["mood"].cat.categories) == list(expected_frame["mood"].cat.categories)
+    assert journals == expected_journals
+
+
+def test_journals_can_be_skipped():
+    frame, journals = stream_compact([json.dumps(LOGS).encode()], journals=False)
+    assert journals == {}
+    assert frame.equals(to_compact(LOGS)[0])
+
+
+def test_empty_array():
+    frame, journals = stream_compact([b" [ ", b"]\n"])
+    assert frame.empty and journals == {}
+
+
+def test_scalars_split_across_chunks():
+    assert list(iter_json_array([b"[1, 2", b"3, tr", b"ue, nu", b"ll]"])) == [1, 23, True, None]
+
+
+@pytest.mark.parametrize("body, message", [
+    ([b"[1,2"], "Truncated"),
+    ([b""], "Empty response"),
+    ([b'{"date": "2025-10-06"}'], "Expected a JSON array"),
+    ([b'[{"date":', b" oops}]"], "Malformed"),
+])
+def test_bad_payloads_raise_value_error(body, message):
+    with pytest.raises(ValueError, match=message):
+        list(iter_json_array(body))
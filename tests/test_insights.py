@@ -0,0 +1,21 @@
+from utils import insights
+from utils.cache import PersistentLRUCache
+
+
+def test_fingerprint_changes_with_history_and_prompt():
+    v1 = insights.prompt_version("template {history}", "model-a")
+    v2 = insights.prompt_version("template v2 {history}", "model-a")
+
+    assert insights.history_fingerprint("summary", v1) == insights.history_fingerprint("summary", v1)
+    assert insights.history_fingerprint("summary", v1) != insights.history_fingerprint("summary 2", v1)
+    assert insights.history_fingerprint("summary", v1) != insights.history_fingerprint("summary", v2)
+    assert v1 != insights.prompt_version("template {history}", "model-b")
+
+
+def test_store_and_get_insight(tmp_path):
+    cache = PersistentLRUCache(str(tmp_path / "insights.json"))
+    key = insights.history_fingerprint("summary", "v1")
+
+    assert insights.get_cached_insight(cache, key) is None
+    insights.store_insight(cache, key, "Try stretching.")
+    assert insights.get_cached_insight(cache, key)["text"] == "Try stretching."
@@ -0,0 +1,39 @@
+import csv
+
+from utils.lexicon import MOODS, MoodPrediction, classify_mood, classify_moods
+
+
+def test_labels_match_the_backend_labels():
+    with open("data/sample_logs.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    predictions = classify_moods(row["journal_text"] for row in rows)
+
+    assert {p.label for p in predictions} <= set(MOODS)
+    agree = sum(p.label == row["mood"] for p, row in zip(predictions, rows))
+    assert agree / len(rows) >= 0.8
+
+
+def test_batch_matches_single_texts():
+    texts = ["Felt productive and proud", "So angry and frustrated", "", None, "Average day"]
+    assert classify_moods(texts) == [classify_mood(t) for t in texts]
+
+
+def test_confidence_hits_and_undecided_texts():
+    assert classify_mood("Angry, furious, I hate this") == MoodPrediction("Angry", 1.0, 3, 3)
+    assert classify_mood("Went to the shop") == MoodPrediction("Neutral", 0.0, 0, 0)
+    # One happy and one sad word: a tie is Neutral with no confidence
+    assert classify_mood("Happy morning but a sad evening") == MoodPrediction("Neutral", 0.0, 2, 0)
+    assert classify_mood("Happy, proud and a bit tired") == MoodPrediction("Happy", 2 / 3, 3, 1)
+
+
+def test_negation_flips_the_mood():
+    assert classify_mood("I am not happy").label == "Sad"
+    assert classify_mood("Never felt sad today").label == "Neutral"
+
+
+def test_negation_lasts_until_the_end_of_the_clause():
+    # Both words are negated, however far from "couldnt"
+    assert classify_mood("Couldnt have a single peaceful moment with a good reading session.").label == "Sad"
+    # ...but not past a clause break
+    assert classify_mood("Not tired, happy and proud").label == "Happy"
+    assert classify_mood("No stress but happy and proud").label == "Happy"
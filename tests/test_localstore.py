@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+
+from utils.localstore import RECORD_DTYPE, LocalLogStore
+from utils.schema import iso_to_day, to_compact, to_records
+
+
+def _frame(rows):
+    return to_compact(rows)
+
+
+def _log(date, mood="Happy", text="ok", water=1):
+    return {"date": date, "water": water, "mood": mood, "journal_text": text}
+
+
+def test_replace_and_load_round_trip(tmp_path):
+    store = LocalLogStore(str(tmp_path))
+    frame, journals = _frame([_log("2025-10-07", mood="Sad"), _log("2025-10-06", mood=None)])
+    store.replace(frame, journals)
+
+    loaded = store.load()
+    assert loaded.equals(frame)
+    assert to_records(loaded, store.journals()) == to_records(frame, journals)
+    assert os.path.getsize(tmp_path / "logs.bin") == 2 * RECORD_DTYPE.itemsize
+
+
+def test_append_last_record_per_day_wins(tmp_path):
+    store = LocalLogStore(str(tmp_path))
+    store.replace(*_frame([_log("2025-10-06"), _log("2025-10-07", mood="Sad")]))
+    store.append(*_frame([_log("2025-10-07", mood="Angry", text="later"), _log("2025-10-08", water=0)]))
+
+    loaded = store.load()
+    assert loaded["day"].tolist() == [iso_to_day(d) for d in ("2025-10-06", "2025-10-07", "2025-10-08")]
+    assert loaded["mood"].tolist() == ["Happy", "Angry", "Happy"]
+    assert store.journals()[iso_to_day("2025-10-07")] == "later"
+
+
+def test_ignores_torn_trailing_record(tmp_path):
+    store = LocalLogStore(str(tmp_path))
+    store.replace(*_frame([_log("2025-10-06")]))
+    with open(tmp_path / "logs.bin", "ab") as f:
+        f.write(b"\x01\x02") # partial record from a crash
+
+    assert len(store.load()) == 1
+
+
+def test_empty_store(tmp_path):
+    store = LocalLogStore(str(tmp_path / "missing"))
+    assert not store.exists()
+    assert store.load().empty
+    assert store.journals() == {}
+
+
+def test_csv_import_export(tmp_path):
+    store = LocalLogStore(str(tmp_path / "store"))
+    sample = pd.read_csv("data/sample_logs.csv")
+
+    assert store.import_csv("data/sample_logs.csv") == len(sample)
+    out = tmp_path / "out.csv"
+    store.export_csv(str(out))
+    exported = pd.read_csv(out)
+
+    pd.testing.assert_frame_equal(exported, sample[exported.columns], check_dtype=False)
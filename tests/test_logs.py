@@ -0,0 +1,64 @@
+import io
+import logging
+
+from utils import logs
+
+
+def make_record(msg, *args, name="mindtrack.test"):
+    return logging.LogRecord(name, logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_drops_repeats_and_reports_them():
+    now = [0.0]
+    limiter = logs.RateLimitFilter(limit=2, window=10, clock=lambda: now[0])
+
+    allowed = [limiter.filter(make_record("sync failed: %s", i)) for i in range(5)]
+    assert allowed == [True, True, False, False, False]
+    assert limiter.filter(make_record("other message")) # Limited per template
+
+    now[0] = 10.0
+    record = make_record("sync failed: %s", 5)
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_rate_limit_opt_out():
+    limiter = logs.RateLimitFilter(limit=1, window=10)
+    records = [make_record("stage=%s", i) for i in range(3)]
+    for record in records:
+        record.rate_limit = False
+    assert all(limiter.filter(r) for r in records)
+
+
+def test_formatter_truncates_long_messages():
+    formatter = logs.BoundedFormatter("%(message)s", max_chars=20)
+    record = make_record("payload: %s", "x" * 1000)
+    record.suppressed = 2
+
+    text = formatter.format(record)
+
+    assert text.startswith("payload: " + "x" * 11 + "…")
+    assert "[1009 chars]" in text and "(+2 similar suppressed)" in text
+    assert formatter.format(make_record("short")) == "short"
+
+
+def test_payload_summary():
+    assert logs.payload_summary(rows=714, nbytes=121_000, latency_ms=9.94) == "rows=714 bytes=118.2KB latency_ms=9.9"
+    assert logs.payload_summary(nbytes=12) == "bytes=12"
+
+
+def test_get_logger_configures_the_app_logger_once():
+    root = logging.getLogger(logs.LOGGER_NAME)
+    handlers = list(root.handlers)
+    try:
+        root.handlers = []
+        stream = io.StringIO()
+        logs.configure_logging(stream=stream)
+        logs.configure_logging(stream=io.StringIO())
+
+        logs.get_logger("utils.data").warning("Log sync failed")
+
+        assert len(root.handlers) == 1
+        assert "WARNING mindtrack.utils.data: Log sync failed" in stream.getvalue()
+    finally:
+        root.handlers = handlers
@@ -0,0 +1,162 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+from utils import mood
+from utils.cache import PersistentLRUCache
+from utils.lexicon import classify_moods
+from utils.outbox import Outbox
+
+
+def _flusher(tmp_path):
+    flusher = mock.Mock()
+    flusher.outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    return flusher
+
+
+def _entry(**fields):
+    return {"date": "2025-10-26", "water": 1, "journal_text": "Great run today", **fields}
+
+
+def test_submit_queues_pending_then_patches_mood(tmp_path):
+    flusher = _flusher(tmp_path)
+    client = mock.Mock()
+    client.predict_mood.return_value = "Happy"
+
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+    with mock.patch.object(mood, "get_outbox_flusher", return_value=flusher), \
+            mock.patch.object(mood, "get_backend_client", return_value=client), \
+            mock.patch.object(mood, "get_prediction_cache", return_value=cache):
+        future = mood.submit_log_with_pending_mood(_entry())
+        assert future.result(timeout=5) == "Happy"
+
+    assert flusher.outbox.pending() == [_entry(mood="Happy")]
+    client.predict_mood.assert_called_once_with("Great run today")
+
+
+def test_failed_prediction_keeps_pending_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(mood, "MOOD_LOCAL_FALLBACK", False)
+    flusher = _flusher(tmp_path)
+    client = mock.Mock()
+    client.predict_mood.side_effect = requests.exceptions.Timeout("slow")
+
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+    pending_entry = _entry(mood=mood.PENDING_MOOD)
+    flusher.outbox.enqueue(pending_entry) # Queued first, as submit_log_with_pending_mood does
+    assert mood._predict_and_patch(client, cache, flusher, pending_entry) is None
+
+    assert len(cache) == 0
+    assert flusher.outbox.pending() == [pending_entry]
+    flusher.wake.assert_not_called() # Nothing new to send
+
+
+def test_cache_key_ignores_case_and_whitespace():
+    assert mood.journal_cache_key("Great  run\ntoday ") == mood.journal_cache_key("great run today")
+    assert mood.journal_cache_key("great run today") != mood.journal_cache_key("great run today", "2")
+
+
+def test_predict_mood_uses_cache(tmp_path):
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+    client = mock.Mock()
+    client.predict_mood.return_value = "Sad"
+
+    assert mood.predict_mood(client, cache, "Low energy today") == "Sad"
+    assert mood.predict_mood(client, cache, "low energy today") == "Sad"
+    client.predict_mood.assert_called_once()
+
+
+def test_prediction_cache_drops_other_model_versions(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.json")
+    old = PersistentLRUCache(path)
+    old.put("a", {"mood": "Happy", "model_version": "0"})
+    old.put("b", {"mood": "Sad", "model_version": mood.MOOD_MODEL_VERSION})
+    monkeypatch.setattr(mood, "MOOD_CACHE_FILE", path)
+
+    cache = mood.get_prediction_cache.__wrapped__() # Bypass st.cache_resource
+
+    assert cache.get("a") is None
+    assert cache.get("b")["mood"] == "Sad"
+
+
+def test_confident_local_prediction_skips_the_backend(tmp_path):
+    client = mock.Mock()
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+
+    assert mood.predict_mood(client, cache, "Felt productive, proud and happy") == "Happy"
+    client.predict_mood.assert_not_called()
+    assert len(cache) == 0 # Only backend answers are cached
+
+
+def test_shortcut_never_contradicts_the_labelled_samples():
+    with open("data/sample_logs.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    for row, local in zip(rows, classify_moods(row["journal_text"] for row in rows)):
+        if mood.is_confident(local):
+            assert local.label == row["mood"], row["journal_text"]
+
+
+def test_weak_local_evidence_asks_the_backend(tmp_path):
+    client = mock.Mock()
+    client.predict_mood.return_value = "Angry"
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+
+    # Two agreeing hits are not enough
+    assert mood.predict_mood(client, cache, "Had a peaceful day with a good reading session.") == "Angry"
+    client.predict_mood.assert_called_once()
+
+
+def test_backend_failure_falls_back_to_the_local_classifier(tmp_path):
+    client = mock.Mock()
+    client.predict_mood.side_effect = requests.exceptions.ConnectionError("down")
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+
+    assert mood.predict_mood(client, cache, "Feeling tired") == "Sad"
+    client.predict_mood.assert_called_once_with("Feeling tired")
+    assert len(cache) == 0 # Asked again once the backend is back
+
+
+def test_recovery_resubmits_pending_outbox_and_synced_entries(tmp_path):
+    flusher = _flusher(tmp_path)
+    flusher.outbox.enqueue(_entry(mood=mood.PENDING_MOOD)) # Process stopped before the patch
+    flusher.outbox.enqueue(_entry(date="2025-10-27", mood="Sad"))
+    store = mock.Mock()
+    store.records.return_value = [
+        _entry(date="2025-10-20", mood=mood.PENDING_MOOD, journal_text=None), # Synced while pending
+        _entry(date="2025-10-21", mood="Happy"),
+        _entry(date="2025-10-27", mood=mood.PENDING_MOOD), # Outbox has the newer version
+    ]
+    client = mock.Mock()
+    client.predict_mood.return_value = "Neutral"
+    cache = PersistentLRUCache(str(tmp_path / "cache.json"))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert mood.recover_pending_moods(executor, client, cache, flusher, store) == 2
+
+    assert flusher.outbox.pending() == [
+        _entry(date="2025-10-20", mood="Neutral", journal_text=None),
+        _entry(mood="Neutral"),
+        _entry(date="2025-10-27", mood="Sad"),
+    ]
+
+
+def test_recovery_without_backend_still_covers_the_outbox(tmp_path):
+    flusher = _flusher(tmp_path)
+    flusher.outbox.enqueue(_entry(mood=mood.PENDING_MOOD))
+    store = mock.Mock()
+    store.records.side_effect = requests.exceptions.ConnectionError("down")
+
+    assert mood.pending_mood_entries(flusher.outbox, store) == [_entry(mood=mood.PENDING_MOOD)]
+
+
+def test_unexpected_prediction_errors_are_logged(tmp_path):
+    flusher = _flusher(tmp_path)
+    cache = mock.Mock()
+    cache.get.side_effect = KeyError("corrupt cache")
+
+    # The executor exits first (inner), so its worker has run the done-callback
+    with mock.patch.object(mood.logger, "error") as error, ThreadPoolExecutor(max_workers=1) as executor:
+        mood._submit_prediction(executor, mock.Mock(), cache, flusher, _entry(mood=mood.PENDING_MOOD))
+    error.assert_called_once()
@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+
+import requests
+
+from utils.outbox import Outbox
+
+
+def _entry(date, mood="Happy"):
+    return {"date": date, "water": 1, "mood": mood, "journal_text": "ok"}
+
+
+def test_pending_dedupes_by_date(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-07", mood="Sad"))
+    outbox.enqueue(_entry("2025-10-06"))
+    outbox.enqueue(_entry("2025-10-07", mood="Happy"))
+
+    assert outbox.pending() == [_entry("2025-10-06"), _entry("2025-10-07", mood="Happy")]
+
+
+def test_flush_sends_latest_per_date_and_acks(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-07", mood="Sad"))
+    outbox.enqueue(_entry("2025-10-07", mood="Happy"))
+    client = mock.Mock()
+
+    assert outbox.flush(client) == 1
+    client.save_log.assert_called_once_with(_entry("2025-10-07", mood="Happy"))
+    assert outbox.pending() == []
+    # Acks are durable: a new Outbox on the same file has nothing to replay
+    assert Outbox(outbox.path).pending() == []
+
+
+def test_flush_stops_on_failure_and_keeps_rest(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-06"))
+    outbox.enqueue(_entry("2025-10-07"))
+    client = mock.Mock()
+    client.save_log.side_effect = [None, requests.exceptions.ConnectionError("down")]
+
+    assert outbox.flush(client) == 1
+    assert outbox.pending() == [_entry("2025-10-07")]
+
+
+def test_survives_torn_last_line(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    outbox = Outbox(str(path))
+    outbox.enqueue(_entry("2025-10-06"))
+    with open(path, "a") as f:
+        f.write('{"op": "log", "id"') # crash mid-write
+
+    assert outbox.pending() == [_entry("2025-10-06")]
+
+
+def test_compacts_acked_records(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.outbox.COMPACT_AFTER", 2)
+    path = tmp_path / "outbox.jsonl"
+    outbox = Outbox(str(path))
+    outbox.enqueue(_entry("2025-10-06"))
+    outbox.enqueue(_entry("2025-10-07"))
+    outbox.flush(mock.Mock())
+
+    assert path.read_text() == ""
+
+
+def test_enqueue_does_not_wait_for_a_slow_flush(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-06"))
+    sending, release = threading.Event(), threading.Event()
+    client = mock.Mock()
+    client.save_log.side_effect = lambda entry: sending.set() or release.wait(5)
+    flush = threading.Thread(target=outbox.flush, args=(client,))
+    flush.start()
+    assert sending.wait(5)
+
+    # The request is still in flight: the file is not locked meanwhile
+    outbox.enqueue(_entry("2025-10-07"))
+    assert [e["date"] for e in outbox.pending()] == ["2025-10-06", "2025-10-07"]
+    release.set()
+    flush.join(5)
+
+    assert outbox.pending() == [_entry("2025-10-07")] # Queued during the flush, still pending
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+def test_rejected_entry_is_dead_lettered_and_rest_sent(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-06", mood=None))
+    outbox.enqueue(_entry("2025-10-07"))
+    client = mock.Mock()
+    client.save_log.side_effect = [_http_error(422), None]
+
+    assert outbox.flush(client) == 1
+    assert outbox.pending() == []
+    [dead] = outbox.rejected()
+    assert dead["entry"] == _entry("2025-10-06", mood=None)
+    assert dead["status"] == 422
+
+    # Not retried on the next flush
+    client.reset_mock()
+    assert outbox.flush(client) == 0
+    client.save_log.assert_not_called()
+
+
+def test_server_errors_and_throttling_are_retried(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-06"))
+    client = mock.Mock()
+    for error in (_http_error(503), _http_error(429), requests.exceptions.Timeout("slow")):
+        client.save_log.side_effect = error
+        assert outbox.flush(client) == 0
+        assert outbox.pending() == [_entry("2025-10-06")]
+    assert outbox.rejected() == []
+
+
+def test_compaction_keeps_dead_letters(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.outbox.COMPACT_AFTER", 1)
+    outbox = Outbox(str(tmp_path / "outbox.jsonl"))
+    outbox.enqueue(_entry("2025-10-06"))
+    client = mock.Mock()
+    client.save_log.side_effect = _http_error(400)
+    outbox.flush(client)
+
+    assert [d["entry"] for d in outbox.rejected()] == [_entry("2025-10-06")]
+    assert outbox.pending() == []
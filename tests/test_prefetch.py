@@ -0,0 +1,79 @@
+import threading
+from unittest import mock
+
+from utils import prefetch
+from utils.aggregates import load_dashboard_aggregates
+from utils.data import LogStore
+
+
+class FakeBackend:
+    def __init__(self, logs):
+        self.logs = logs
+        self.calls = 0
+
+    def get_all_logs(self, since=None):
+        self.calls += 1
+        return [log for log in self.logs if since is None or log["date"] >= since]
+
+
+LOGS = [
+    {"date": "2024-12-31", "water": 1, "reading": 0, "mood": "Happy"},
+    {"date": "2025-01-01", "water": 1, "reading": 1, "mood": "Sad"},
+]
+
+
+def test_warm_dashboard_fills_store_and_default_renders():
+    backend = FakeBackend(LOGS)
+    store = LogStore(client=backend)
+    with mock.patch.object(prefetch, "render_habit_calendar") as calendar, \
+         mock.patch.object(prefetch, "trend_frame") as trend:
+        prefetch.warm_dashboard(store)
+
+    aggregates = load_dashboard_aggregates(store)
+    assert backend.calls == 1 # The dashboard's own load is served from the warm store
+    assert aggregates.days_logged == 2
+    calendar.assert_called_once_with(aggregates.daily_fingerprint, aggregates.daily_totals, (2025,))
+    trend.assert_called_once_with(aggregates.daily_fingerprint, aggregates.daily_totals, None)
+
+
+def test_warm_dashboard_skips_renders_without_logs():
+    with mock.patch.object(prefetch, "render_habit_calendar") as calendar:
+        prefetch.warm_dashboard(LogStore(client=FakeBackend([])))
+    calendar.assert_not_called()
+
+
+def test_requests_merge_while_one_is_queued():
+    prefetcher = prefetch.Prefetcher()
+    running, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(name):
+        calls.append(name)
+        running.set()
+        release.wait(5)
+
+    first = prefetcher.submit(slow, "first")
+    running.wait(5)
+    second = prefetcher.submit(slow, "second") # Queued behind the running one
+    assert prefetcher.submit(slow, "third") is None # Merged into "second"
+    release.set()
+    first.result(5)
+    second.result(5)
+
+    assert calls == ["first", "second"]
+
+
+def test_failures_are_logged_not_raised():
+    prefetcher = prefetch.Prefetcher()
+    with mock.patch.object(prefetch.logger, "warning") as warning:
+        future = prefetcher.submit(mock.Mock(side_effect=ConnectionError("down")))
+        assert future.result(5) is None
+    warning.assert_called_once()
+    assert prefetcher.submit(lambda: None).result(5) is None # Still accepts work
+
+
+def test_disabled_prefetch_does_nothing(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", False)
+    prefetcher = mock.Mock()
+    assert prefetch.prefetch_dashboard(mock.Mock(), prefetcher) is None
+    prefetcher.submit.assert_not_called()
@@ -0,0 +1,119 @@
+import json
+from unittest import mock
+
+import pytest
+import requests
+
+from utils import rescore
+from utils.embedded import EmbeddedBackend
+
+
+def _log(date, mood="Happy", text="ok"):
+    return {"date": date, "exercise": 0, "water": 1, "reading": 0, "meditation": 0,
+            "mood": mood, "journal_text": text}
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = EmbeddedBackend(str(tmp_path / "mindtrack.db"))
+    backend.reset_logs()
+    with backend._transaction() as conn:
+        conn.execute("DELETE FROM logs")
+    backend.save_logs([_log(f"2030-01-{day:02d}", text=f"entry {day}") for day in range(1, 8)])
+    backend.save_log(_log("2030-01-08", text=None)) # No journal: nothing to score
+    yield backend
+    backend.close()
+
+
+def _sad_for_even_days(texts):
+    return ["Sad" if int(t.split()[1]) % 2 == 0 else "Happy" for t in texts]
+
+
+def test_rescore_writes_changed_moods_and_checkpoints(backend, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    stats = rescore.rescore(backend, _sad_for_even_days, "v2", checkpoint, chunk_size=2, workers=2)
+
+    assert stats == rescore.RescoreStats(total=7, skipped=0, scored=7, changed=3, failed=0)
+    moods = {log["date"]: log["mood"] for log in backend.get_all_logs()}
+    assert [moods[f"2030-01-{d:02d}"] for d in range(1, 8)] == ["Happy", "Sad"] * 3 + ["Happy"]
+    with open(checkpoint) as f:
+        assert json.load(f) == {"model_version": "v2", "done": [f"2030-01-{d:02d}" for d in range(1, 8)]}
+
+
+def test_interrupted_run_resumes_from_the_checkpoint(backend, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    calls = []
+
+    def flaky(texts):
+        calls.append(list(texts))
+        return [None if t == "entry 5" else "Sad" for t in texts]
+
+    first = rescore.rescore(backend, flaky, "v2", checkpoint, chunk_size=3, workers=1)
+    assert (first.scored, first.failed) == (6, 1)
+
+    calls.clear()
+    second = rescore.rescore(backend, flaky, "v2", checkpoint, chunk_size=3, workers=1)
+    assert calls == [["entry 5"]] # Only the failed journal is retried
+    assert (second.skipped, second.failed) == (6, 1)
+
+    # A new model version starts over
+    third = rescore.rescore(backend, _sad_for_even_days, "v3", checkpoint, chunk_size=3, workers=1)
+    assert third.skipped == 0 and third.scored == 7
+
+
+def test_dry_run_writes_nothing(backend, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    stats = rescore.rescore(backend, rescore.local_scorer, "lexicon", checkpoint, dry_run=True)
+
+    assert stats.scored == 7
+    assert {log["mood"] for log in backend.get_all_logs()} == {"Happy"}
+    assert rescore.load_checkpoint(checkpoint, "lexicon") == set()
+
+
+def test_http_write_backs_are_rate_limited(backend, tmp_path):
+    client = mock.Mock(spec=["get_all_logs", "save_log"]) # The HTTP API: no bulk save_logs
+    client.get_all_logs.return_value = backend.get_all_logs()
+    limiter = mock.Mock()
+
+    stats = rescore.rescore(client, _sad_for_even_days, "v2", str(tmp_path / "checkpoint.json"),
+                            chunk_size=4, workers=1, limiter=limiter)
+
+    assert stats.changed == client.save_log.call_count == limiter.wait.call_count == 3
+
+
+def test_failed_write_back_stops_cleanly(backend, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    client = mock.Mock(spec=["get_all_logs", "save_log"])
+    client.get_all_logs.return_value = backend.get_all_logs()
+    # First chunk (days 1-2) is written, then the breaker opens
+    client.save_log.side_effect = [None, rescore.requests.exceptions.ConnectionError("down")]
+
+    stats = rescore.rescore(client, _sad_for_even_days, "v2", checkpoint, chunk_size=2, workers=1)
+
+    assert stats == rescore.RescoreStats(total=7, skipped=0, scored=2, changed=1, failed=5)
+    assert rescore.load_checkpoint(checkpoint, "v2") == {"2030-01-01", "2030-01-02"}
+    assert client.save_log.call_count == 2 # No more writes after the failure
+
+
+def test_backend_scorer_is_rate_limited_and_tolerates_failures():
+    client = mock.Mock()
+    client.predict_mood.side_effect = ["Happy", requests.exceptions.Timeout("slow"), "Sad"]
+    limiter = mock.Mock()
+
+    assert rescore.backend_scorer(client, limiter)(["a", "b", "c"]) == ["Happy", None, "Sad"]
+    assert limiter.wait.call_count == 3
+
+
+def test_rate_limiter_spaces_calls():
+    now, slept = [0.0], []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+    limiter = rescore.RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+
+    for _ in range(3):
+        limiter.wait()
+
+    assert slept == [0.25, 0.25]
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from utils.schema import HABITS, day_index, habit_matrix, iso_to_day, to_compact, to_records
+
+
+def _raw():
+    return [
+        {"date": "2025-10-07", "water": "1", "reading": 0, "meditation": 1.0, "exercise": None,
+         "mood": "Happy", "journal_text": "first"},
+        {"date": "2025-10-06", "water": 0, "reading": 1, "meditation": 0, "exercise": 1,
+         "mood": None, "journal_text": None},
+        {"date": "2025-10-07", "water": 1, "reading": 1, "meditation": 1, "exercise": 1,
+         "mood": "Sad", "journal_text": "second"},
+    ]
+
+
+def test_compact_dtypes_and_dedupe():
+    frame, journals = to_compact(_raw())
+
+    assert dict(frame.dtypes.astype(str)) == {"day": "int32", "habits": "uint8", "mood": "category"}
+    assert frame["day"].tolist() == [iso_to_day("2025-10-06"), iso_to_day("2025-10-07")]
+    assert frame["habits"].tolist() == [0b1010, 0b1111]
+    assert journals == {iso_to_day("2025-10-07"): "second"}
+
+
+def test_unpack_helpers():
+    frame, _ = to_compact(_raw())
+
+    assert habit_matrix(frame).tolist() == [[0, 1, 0, 1], [1, 1, 1, 1]]
+    assert list(day_index(frame)) == list(pd.to_datetime(["2025-10-06", "2025-10-07"]))
+
+
+def test_round_trip_to_records():
+    frame, journals = to_compact(_raw())
+    records = to_records(frame, journals)
+
+    assert records[0] == {"date": "2025-10-06", **dict(zip(HABITS, [0, 1, 0, 1])), "mood": None, "journal_text": None}
+    assert records[1]["mood"] == "Sad" and records[1]["journal_text"] == "second"
+
+
+def test_compact_is_smaller_than_raw_frame():
+    raw = pd.DataFrame(_raw() * 1000)
+    raw["date"] = pd.date_range("2000-01-01", periods=len(raw)).strftime("%Y-%m-%d")
+    frame, _ = to_compact(raw)
+
+    assert frame.memory_usage(deep=True).sum() * 10 < raw.memory_usage(deep=True).sum()
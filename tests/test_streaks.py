@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from utils.streaks import StreakRun, compute_streaks
+
+TODAY = date(2025, 10, 26)
+
+
+def _days(*offsets):
+    return [TODAY - timedelta(days=o) for o in offsets]
+
+
+def test_empty_input():
+    assert compute_streaks(np.array([]), today=TODAY) == (0, 0, [])
+
+
+def test_current_streak_ending_today():
+    summary = compute_streaks(_days(0, 1, 2, 5, 6), today=TODAY)
+
+    assert summary.current == 3
+    assert summary.longest == 3
+
+
+def test_current_streak_ending_yesterday():
+    assert compute_streaks(_days(1, 2), today=TODAY).current == 2
+
+
+def test_streak_broken_before_yesterday():
+    assert compute_streaks(_days(2, 3, 4), today=TODAY).current == 0
+
+
+def test_runs_duplicates_and_unsorted_input():
+    dates = _days(6, 0, 5, 1, 0, 9)
+    summary = compute_streaks(dates, today=TODAY)
+
+    assert summary.runs == [
+        StreakRun(TODAY - timedelta(days=9), TODAY - timedelta(days=9), 1),
+        StreakRun(TODAY - timedelta(days=6), TODAY - timedelta(days=5), 2),
+        StreakRun(TODAY - timedelta(days=1), TODAY, 2),
+    ]
+    assert summary.longest == 2
+
+
+def test_accepts_timestamps():
+    import pandas as pd
+
+    dates = pd.to_datetime(["2025-10-25 08:00", "2025-10-26 21:30"]).date
+    assert compute_streaks(dates, today=TODAY).current == 2
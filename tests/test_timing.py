@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from utils import timing
+
+
+@pytest.fixture
+def records():
+    """Collects this thread's stages the way a page run does."""
+    timing._local.records = []
+    yield timing._local.records
+    del timing._local.records
+
+
+def test_disabled_stage_is_a_shared_noop(monkeypatch, records):
+    monkeypatch.setattr(timing, "TIMINGS_ENABLED", False)
+    monkeypatch.setattr(timing, "DEBUG_PANEL", False)
+
+    with timing.stage("fetch") as timed:
+        timed.set(rows=3)
+
+    assert timing.stage("other") is timing.stage("fetch")
+    assert records == []
+
+
+def test_enabled_stage_records_and_logs(monkeypatch, records, caplog):
+    monkeypatch.setattr(timing, "TIMINGS_ENABLED", True)
+
+    with caplog.at_level(logging.INFO, logger="utils.timing"):
+        with timing.stage("load", source="backend"):
+            with timing.stage("fetch") as timed:
+                timed.set(rows=3)
+
+    (inner, inner_ms, inner_depth, inner_fields), (outer, outer_ms, outer_depth, _) = records
+    assert (inner, inner_depth, inner_fields) == ("fetch", 1, {"rows": 3})
+    assert (outer, outer_depth) == ("load", 0)
+    assert outer_ms >= inner_ms >= 0
+    assert "stage=fetch" in caplog.text and "rows=3" in caplog.text
+    assert "source=backend" in caplog.text
+
+
+def test_failed_stage_is_recorded_and_reraised(monkeypatch, records):
+    monkeypatch.setattr(timing, "TIMINGS_ENABLED", True)
+
+    with pytest.raises(ValueError):
+        with timing.stage("fetch"):
+            raise ValueError("boom")
+
+    assert records[0][3] == {"error": "ValueError"}
+    assert getattr(timing._local, "depth", 0) == 0
@@ -0,0 +1,101 @@
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from utils.charts import series_fingerprint
+from utils.data import SAMPLE_LOGS_FILE, get_log_store
+from utils.localstore import MIRROR_DIR, LocalLogStore, open_sample_store
+from utils.mood import PENDING_MOOD
+from utils.schema import HABITS, day_index, habit_matrix
+from utils.streaks import StreakSummary, compute_streaks
+from utils.timing import stage
+
+# Bar chart order
+BAR_ORDER = ["exercise", "water", "reading", "meditation"]
+
+
+@dataclass(frozen=True)
+class DashboardAggregates:
+    """
+    Everything the dashboard renders, computed once per data version.
+    Treat the pandas objects as read-only: the same instance is shared by every session.
+    """
+    days_logged: int
+    streaks: StreakSummary
+    daily_totals: pd.Series # total habits per day, DatetimeIndex, sorted
+    daily_fingerprint: str # content hash of daily_totals (render cache key)
+    max_habits: int
+    habit_counts: tuple # ((habit, days completed), ...)
+    mood_counts: tuple # ((mood, count), ...), most common first
+    pending_moods: int
+
+
+def compute_aggregates(logs):
+    """
+    Builds DashboardAggregates from compact logs (see utils.schema) in one pass:
+    the habit bitmask is unpacked once, and per-day totals, per-habit counts, mood
+    counts and streaks are all derived from those arrays.
+    """
+    matrix = habit_matrix(logs)
+    dates = day_index(logs)
+
+    daily_totals = pd.Series(matrix.sum(axis=1).astype(float), index=dates, name='total_habits')
+    per_habit = dict(zip(HABITS, matrix.sum(axis=0).astype(float).tolist()))
+    habit_counts = tuple((habit, per_habit[habit]) for habit in BAR_ORDER) if len(logs) else ()
+
+    moods = logs['mood'].value_counts()
+    mood_counts = tuple((str(m), int(n)) for m, n in moods[moods > 0].items())
+
+    return DashboardAggregates(
+        days_logged=len(logs),
+        streaks=compute_streaks(dates),
+        daily_totals=daily_totals,
+        daily_fingerprint=series_fingerprint(daily_totals),
+        max_habits=len(HABITS),
+        habit_counts=habit_counts,
+        mood_counts=mood_counts,
+        pending_moods=int(moods.get(PENDING_MOOD, 0)),
+    )
+
+
+def _timed_aggregates(logs):
+    with stage("aggregate", rows=len(logs)):
+        return compute_aggregates(logs)
+
+
+def load_dashboard_aggregates(store=None):
+    """Aggregates of the synced backend logs, recomputed only when the data changes."""
+    return (store or get_log_store()).derived("dashboard", _timed_aggregates)
+
+
+@st.cache_resource(max_entries=4)
+def _local_aggregates(directory, version_stamp):
+    """Cached per (directory, version_stamp): a changed store gets a new stamp, so it is recomputed."""
+    return compute_aggregates(LocalLogStore(directory).load())
+
+
+def _stamp(store):
+    path = store._path("logs.bin")
+    if not store.exists():
+        return None
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_offline_aggregates():
+    """
+    Aggregates for when the backend can't be reached, read from the on-disk store
+    (a memory map, no CSV parse): the last synced mirror of the backend if there is
+    one, otherwise the bundled sample logs. Returns (aggregates, source label).
+    """
+    mirror = LocalLogStore(MIRROR_DIR)
+    stamp = _stamp(mirror)
+    if stamp is not None:
+        aggregates = _local_aggregates(mirror.directory, stamp)
+        if aggregates.days_logged:
+            return aggregates, "your last synced data"
+
+    sample = open_sample_store(SAMPLE_LOGS_FILE)
+    return _local_aggregates(sample.directory, _stamp(sample)), "local sample data"
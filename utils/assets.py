@@ -0,0 +1,39 @@
+import io
+import os
+
+import streamlit as st
+
+from utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Asset config ---
+ICON_DIR = "assets/icons"
+ICON_NAMES = ("water", "reading", "meditation", "exercise")
+ICON_SIZE = 128 # Display width on the Daily Log page
+
+
+@st.cache_resource(show_spinner=False)
+def load_icon(path, size=ICON_SIZE):
+    """
+    Returns the icon at `path` resized to `size` px and encoded as PNG bytes, or None
+    if the file is missing. Decoded once per process and shared by every rerun and
+    session; st.image sends the bytes as they are.
+    """
+    # Deferred: PIL is only needed on a cache miss
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", optimize=True)
+    except FileNotFoundError:
+        logger.warning("Icon not found at %s", path)
+        return None
+    return buffer.getvalue()
+
+
+def load_icons(names=ICON_NAMES, size=ICON_SIZE):
+    """Returns {name: PNG bytes or None} for the habit icons in ICON_DIR."""
+    return {name: load_icon(os.path.join(ICON_DIR, f"{name}.png"), size) for name in names}
@@ -0,0 +1,275 @@
+import os
+import threading
+import time
+
+import requests
+import streamlit as st
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.ingest import stream_compact
+from utils.logs import get_logger, payload_summary
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+# --- Backend config ---
+BACKEND_URL = os.getenv("BACKEND_URL")
+# "remote": the HTTP API at BACKEND_URL; "embedded": in-process SQLite store (utils.embedded)
+BACKEND_MODE = os.getenv("BACKEND_MODE", "remote").lower()
+
+# Per-endpoint timeouts (seconds)
+TIMEOUTS = {
+    "get_all_logs": 5,
+    "log": 10,
+    "predict_mood": 20,
+    "reset_logs": 10,
+}
+
+STREAM_CHUNK_SIZE = 64 * 1024 # Bytes read at a time when streaming /get_all_logs
+
+MAX_RETRIES = int(os.getenv("BACKEND_MAX_RETRIES", "2"))
+RETRY_BACKOFF = float(os.getenv("BACKEND_RETRY_BACKOFF", "0.3"))
+
+# Circuit breaker: after this many consecutive failures, stop calling the backend for a while
+BREAKER_THRESHOLD = int(os.getenv("BACKEND_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = float(os.getenv("BACKEND_BREAKER_COOLDOWN", "30"))
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """Raised without touching the network when the backend is known to be down."""
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures. Once `threshold` is reached the circuit opens and
+    calls fail fast for `cooldown` seconds; after that one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit. Other callers keep
+    failing fast while the trial is in flight (or until it's `cooldown` old, in case
+    its outcome is never reported).
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started = None
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown:
+                return False
+            if self._trial_started is not None and now - self._trial_started < self.cooldown:
+                return False # Another caller's trial call is in flight
+            self._trial_started = now # Half-open: this caller makes the trial call
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold or self._trial_started is not None:
+                self._opened_at = time.monotonic() # A failed trial re-opens it right away
+                self._trial_started = None
+
+    @property
+    def is_open(self):
+        """True while new calls fail fast (cooling down, or a trial call in flight)."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return time.monotonic() - self._opened_at < self.cooldown or self._trial_started is not None
+
+
+class _InFlightCall:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the function,
+    callers arriving while it is in flight wait and get the same result (or exception).
+    Nothing is cached; once the call returns, the next one goes to the backend again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {} # key -> _InFlightCall
+
+    def do(self, key, fn):
+        """Returns fn(), shared with every concurrent caller using the same `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlightCall()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug("Coalesced %d concurrent calls for %s", call.waiters, key)
+            call.done.set()
+        return call.result
+
+
+def _make_session(retries=MAX_RETRIES, backoff=RETRY_BACKOFF):
+    """A keep-alive session; connection errors are retried for every method, 5xx only for GET."""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class BackendClient:
+    """
+    Thin client for the MindTrack backend API, sharing one pooled session.
+    Concurrent identical /get_all_logs requests (e.g. many sessions opening the
+    dashboard at once) share one backend call; treat the returned logs as read-only.
+    stream_logs() reads the same endpoint straight into the compact schema.
+    """
+
+    def __init__(self, base_url=BACKEND_URL, session=None, breaker=None, timeouts=None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.session = session or _make_session()
+        self.breaker = breaker or CircuitBreaker()
+        self.timeouts = {**TIMEOUTS, **(timeouts or {})}
+        self._inflight = SingleFlight()
+
+    def _request(self, method, endpoint, **kwargs):
+        if not self.base_url:
+            raise BackendUnavailable("BACKEND_URL is not set")
+        if not self.breaker.allow():
+            raise BackendUnavailable("Backend marked as down, skipping request")
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}/{endpoint}", timeout=self.timeouts[endpoint], **kwargs
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.breaker.record_failure()
+            logger.warning("%s /%s failed: %s", method, endpoint, e)
+            raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        logger.debug(
+            "%s /%s status=%s %s", method, endpoint, response.status_code,
+            payload_summary(latency_ms=(time.perf_counter() - started) * 1000),
+        )
+        response.raise_for_status() # Raise an error if status is 4xx/5xx
+        return response
+
+    # --- Endpoints ---
+
+    def get_all_logs(self, since=None):
+        return self._inflight.do(("get_all_logs", since), lambda: self._get_all_logs(since))
+
+    def _get_all_logs(self, since):
+        params = {"since": since} if since else None
+        started = time.perf_counter()
+        response = self._request("GET", "get_all_logs", params=params)
+        data = response.json()
+        logger.info("Fetched logs since=%s %s", since, payload_summary(
+            rows=len(data), nbytes=len(response.content), latency_ms=(time.perf_counter() - started) * 1000,
+        ))
+        return data
+
+    def stream_logs(self, since=None, journals=True):
+        """
+        Like get_all_logs, but parses the response as it arrives into the compact schema
+        (see utils.ingest), so peak memory stays near the size of the final frame.
+        Returns (frame, journals); with journals=False journal texts are skipped.
+        """
+        return self._inflight.do(("stream_logs", since, journals), lambda: self._stream_logs(since, journals))
+
+    def _stream_logs(self, since, journals):
+        params = {"since": since} if since else None
+        started = time.perf_counter()
+        received = 0
+
+        def chunks(response):
+            nonlocal received
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+
+        with self._request("GET", "get_all_logs", params=params, stream=True) as response:
+            try:
+                frame, texts = stream_compact(chunks(response), journals=journals)
+            except ValueError as e: # Same family as response.json() failing
+                raise requests.exceptions.InvalidJSONError(f"Bad /get_all_logs payload: {e}") from e
+        logger.info("Streamed logs since=%s journals=%s %s", since, journals, payload_summary(
+            rows=len(frame), nbytes=received, latency_ms=(time.perf_counter() - started) * 1000,
+        ))
+        return frame, texts
+
+    def save_log(self, entry):
+        return self._request("POST", "log", json=entry)
+
+    def predict_mood(self, text):
+        """Returns the predicted mood label for a journal text."""
+        data = self._request("POST", "predict_mood", json={"text": text}).json()
+        return data.get("mood", "Neutral")
+
+    def reset_logs(self):
+        return self._request("POST", "reset_logs")
+
+
+@st.cache_resource
+def get_backend_client():
+    """
+    The single backend client shared by every page and session: a BackendClient (and
+    its connection pool), or the EmbeddedBackend when BACKEND_MODE=embedded.
+    """
+    if BACKEND_MODE == "embedded":
+        from utils.embedded import EMBEDDED_DB_FILE, EmbeddedBackend
+        logger.info("Embedded backend using %s", EMBEDDED_DB_FILE)
+        return EmbeddedBackend()
+    logger.info("Backend client created for %s", BACKEND_URL or "<BACKEND_URL not set>")
+    return BackendClient()
@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class PersistentLRUCache:
+    """
+    Small size-bounded LRU cache persisted to a JSON file.
+    Values must be JSON-serializable. Writes are atomic (temp file + rename), so a
+    crash never leaves a half-written cache behind.
+    """
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return OrderedDict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+            return OrderedDict()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._entries.items()), f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False) # Evict least recently used
+            self._save()
+
+    def discard_where(self, predicate):
+        """Removes every entry whose value matches `predicate`. Returns how many were removed."""
+        with self._lock:
+            stale = [k for k, v in self._entries.items() if predicate(v)]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+            return len(stale)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,98 @@
+import hashlib
+import io
+import threading
+
+import pandas as pd
+import streamlit as st
+
+# rcParams (used by style contexts) are process-global, so renders take turns
+_RENDER_LOCK = threading.Lock()
+
+
+def series_fingerprint(series):
+    """Stable content hash of a series (index + values), used as a render cache key."""
+    hashed = pd.util.hash_pandas_object(series, index=True).values
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_habit_calendar(fingerprint, _heatmap_data, years, fmt="png"):
+    """
+    Renders the habit calendar heatmap for the given years and returns the encoded
+    image bytes (PNG or SVG). The figure is built on an explicit Figure object, never
+    pyplot's global state. Results are cached on (fingerprint, years, fmt), so other
+    reruns and sessions with the same data skip rendering entirely.
+    """
+    # Deferred: matplotlib/calplot are slow to import and only needed on a cache miss
+    import calplot
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    data = _heatmap_data[_heatmap_data.index.year.isin(years)]
+    by_day = data.resample('D').sum()
+
+    with _RENDER_LOCK, matplotlib.style.context('dark_background'):
+        fig = Figure(figsize=(12, 2.5 * len(years)))
+        axes = fig.subplots(nrows=len(years), ncols=1, squeeze=False)[:, 0]
+
+        max_weeks = 0
+        for year, ax in zip(sorted(years), axes):
+            calplot.yearplot(
+                by_day,
+                year=year,
+                how=None,
+                ax=ax,
+                cmap='YlGn',
+                edgecolor='black',
+                fillcolor='gray',
+                linewidth=0.5,
+                textformat='{:.0f}',
+                vmin=0,
+                vmax=4,
+            )
+            ax.set_ylabel(str(year), fontsize=30, color='gray', fontweight='bold', ha='center')
+            max_weeks = max(max_weeks, ax.get_xlim()[1])
+
+        # Leap years can have 54 weeks; keep every year the same width
+        for ax in axes:
+            ax.set_xlim(0, max_weeks)
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, bbox_inches='tight')
+
+    return buffer.getvalue()
+
+
+# --- Daily Progress Trend ---
+
+TREND_RANGES = {"Last 30 days": 30, "Last 90 days": 90, "Last 365 days": 365, "All": None}
+TREND_MAX_POINTS = 120 # Above this, the series is resampled to weekly, monthly, ... means
+
+# Rolling-average window (in points) for each resolution
+_ROLLING_WINDOW = {"daily": 7, "weekly": 4, "monthly": 3, "quarterly": 4, "yearly": 2}
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def trend_frame(fingerprint, _daily_totals, days=None, max_points=TREND_MAX_POINTS):
+    """
+    Returns (frame, resolution) for the trend chart: the last `days` days of history
+    (counted back from the latest log), resampled to weekly or monthly means when there
+    are more than `max_points` points (quarterly/yearly for very long histories),
+    plus a rolling average column.
+    The frame has columns date, total_habits, rolling_avg; cached on (fingerprint, days).
+    """
+    series = _daily_totals
+    if days is not None and not series.empty:
+        series = series[series.index > series.index[-1] - pd.Timedelta(days=days)]
+
+    resolution = "daily"
+    for rule, name in (("W", "weekly"), ("MS", "monthly"), ("QS", "quarterly"), ("YS", "yearly")):
+        if len(series) <= max_points:
+            break
+        series = series.resample(rule).mean().dropna()
+        resolution = name
+
+    frame = series.rename('total_habits').rename_axis('date').reset_index()
+    frame['rolling_avg'] = frame['total_habits'].rolling(_ROLLING_WINDOW[resolution], min_periods=1).mean()
+    return frame, resolution
@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import requests
+import streamlit as st
+from dotenv import load_dotenv
+from utils.backend import get_backend_client
+from utils.localstore import MIRROR_DIR, LocalLogStore
+from utils.schema import day_to_iso, to_compact, to_records
+from utils.logs import get_logger
+from utils.timing import stage
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+# --- Data config ---
+SAMPLE_LOGS_FILE = "data/sample_logs.csv" # The fallback file
+
+# How long (seconds) the local copy is trusted before asking the backend for new entries
+LOGS_CACHE_TTL = int(os.getenv("LOGS_CACHE_TTL", "300"))
+# Delta syncs only see new days; edits to older days (e.g. utils.rescore) arrive with
+# the next full download, done at most this often (seconds)
+LOGS_FULL_RELOAD_TTL = int(os.getenv("LOGS_FULL_RELOAD_TTL", "3600"))
+
+
+# --- Backend fetch ---
+
+def _fetch_logs(since=None, client=None):
+    """
+    Fetches logs from the backend. With `since` (YYYY-MM-DD) only entries on or
+    after that date are requested; backends that don't support it return everything.
+    """
+    with stage("backend_fetch", since=since) as timed:
+        data = (client or get_backend_client()).get_all_logs(since=since)
+        timed.set(rows=len(data))
+    return data
+
+
+def _fetch_compact(since=None, client=None, journals=True):
+    """
+    Fetches logs straight into the compact schema. Returns (frame, journals, complete):
+    clients with stream_logs parse the response as it arrives and skip journal texts
+    unless `journals` is set (complete=False); other clients return every journal.
+    """
+    client = client or get_backend_client()
+    if hasattr(client, "stream_logs"):
+        with stage("backend_fetch", since=since, streamed=True) as timed:
+            frame, texts = client.stream_logs(since=since, journals=journals)
+            timed.set(rows=len(frame))
+        return frame, texts, journals
+
+    raw = _fetch_logs(since=since, client=client)
+    with stage("compact", rows=len(raw)):
+        frame, texts = to_compact(raw)
+    return frame, texts, True
+
+
+# --- Journal text ---
+
+class JournalStore:
+    """
+    Journal texts keyed by day, kept out of the log frame so the dashboard (which
+    never needs them) doesn't carry them around. Only AI Insights reads them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._texts = {}
+
+    def get(self, day):
+        with self._lock:
+            return self._texts.get(day)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._texts)
+
+    def update(self, texts):
+        with self._lock:
+            self._texts.update(texts)
+
+    def replace(self, texts):
+        with self._lock:
+            self._texts = dict(texts)
+
+
+# --- Local materialized copy ---
+
+class LogStore:
+    """
+    Process-wide local copy of the backend logs, in the compact schema from
+    utils.schema (day ordinal, habit bitmask, categorical mood); journal texts
+    live in a separate JournalStore.
+    After the first full download it only asks for entries since the last-seen
+    date and merges them in, falling back to a full reload when the backend
+    ignores the `since` filter, after an explicit reset, or every
+    LOGS_FULL_RELOAD_TTL seconds.
+
+    If a delta sync fails, the existing copy keeps being served and the next
+    attempt waits another LOGS_CACHE_TTL. Only a failing full reload (no copy
+    yet, or after a reset) raises to the caller.
+
+    Journal texts are only downloaded once someone asks for records() (AI
+    Insights); until then a dashboard-only process never holds them.
+
+    With a `mirror` (LocalLogStore), every change is also written to disk so the
+    data is available offline. `client` defaults to the shared BackendClient.
+    """
+
+    def __init__(self, mirror=None, client=None):
+        self.mirror = mirror
+        self.client = client
+        self._lock = threading.Lock()
+        self._frame = None
+        self.journals = JournalStore()
+        self._synced_at = 0.0
+        self._reloaded_at = 0.0
+        self._needs_full_reload = True
+        self._want_journals = False
+        self._journals_deferred = False # The last full reload skipped journal texts
+        self._version = 0 # Bumped whenever the synced data changes
+        self._derived = {}
+
+    def _refresh(self):
+        if self._frame is None or self._needs_full_reload:
+            self._full_reload()
+        elif time.monotonic() - self._synced_at > LOGS_CACHE_TTL:
+            self._sync_since()
+
+    def frame(self):
+        """Returns a copy of the synced (compact) logs, refreshing from the backend if stale."""
+        with self._lock:
+            self._refresh()
+            return self._frame.copy()
+
+    def derived(self, name, compute):
+        """
+        Returns compute(frame), computed once per data version and shared by every caller
+        (e.g. the dashboard aggregates). `compute` must not modify the frame.
+        """
+        with self._lock:
+            self._refresh()
+            cached = self._derived.get(name)
+            if cached is None or cached[0] != self._version:
+                cached = (self._version, compute(self._frame))
+                self._derived[name] = cached
+            return cached[1]
+
+    def records(self):
+        """Returns the synced logs (with journals) as a list of dicts, the same shape as /get_all_logs."""
+        with self._lock:
+            self._want_journals = True
+            if self._journals_deferred:
+                self._needs_full_reload = True
+            self._refresh()
+            frame = self._frame.copy()
+        return to_records(frame, self.journals.snapshot())
+
+    def invalidate(self, full=False):
+        """Marks the copy stale. `full=True` forces a complete reload (e.g. after a reset)."""
+        with self._lock:
+            self._synced_at = 0.0
+            if full:
+                self._needs_full_reload = True
+
+    def _write_mirror(self, method, frame, journals):
+        if self.mirror is None:
+            return
+        try:
+            getattr(self.mirror, method)(frame, journals)
+        except OSError as e: # The mirror is best-effort; never fail a page over it
+            logger.warning("Could not update local log mirror: %s", e)
+
+    def _full_reload(self):
+        self._frame, journals, complete = _fetch_compact(client=self.client, journals=self._want_journals)
+        self._journals_deferred = not complete
+        self.journals.replace(journals)
+        self._write_mirror("replace", self._frame, journals if complete else None)
+        self._synced_at = self._reloaded_at = time.monotonic()
+        self._needs_full_reload = False
+        self._version += 1
+
+    def _sync_since(self):
+        if self._frame.empty:
+            return self._full_reload()
+
+        last_day = int(self._frame['day'].max())
+        full = time.monotonic() - self._reloaded_at > LOGS_FULL_RELOAD_TTL
+        try:
+            delta, journals, complete = _fetch_compact(
+                since=None if full else day_to_iso(last_day), client=self.client, journals=self._want_journals,
+            )
+        except requests.exceptions.RequestException as e:
+            # Keep serving the local copy; try again after another TTL
+            logger.warning("Log sync failed, serving local copy: %s", e)
+            self._synced_at = time.monotonic()
+            return
+
+        if full or (not delta.empty and (delta['day'] < last_day).any()):
+            # Full history (periodic reload, or the backend ignored `since`): use it as-is
+            self._frame = delta
+            self._journals_deferred = not complete
+            self.journals.replace(journals)
+            self._write_mirror("replace", delta, journals if complete else None)
+            self._reloaded_at = time.monotonic()
+            self._version += 1
+        elif not delta.empty:
+            merged = pd.concat([self._frame, delta], ignore_index=True)
+            merged = merged.drop_duplicates(subset=['day'], keep='last')
+            merged = merged.sort_values(by='day', ignore_index=True)
+            merged['mood'] = merged['mood'].astype('category')
+            self.journals.update(journals)
+            if not merged.equals(self._frame): # `since` is inclusive, so the last day comes back every time
+                self._frame = merged
+                self._write_mirror("append", delta, journals)
+                self._version += 1
+
+        self._synced_at = time.monotonic()
+
+
+@st.cache_resource
+def get_log_store():
+    """The single LogStore shared by every page and session in this process."""
+    return LogStore(mirror=LocalLogStore(MIRROR_DIR))
+
+
+def load_logs_frame():
+    """Returns the (incrementally synced) logs as a compact DataFrame."""
+    return get_log_store().frame()
+
+
+def fetch_all_logs():
+    """Returns the (incrementally synced) logs as a list of dicts."""
+    return get_log_store().records()
+
+
+def invalidate_logs(full=False):
+    """Marks the shared logs stale. Call after /log; pass full=True after /reset_logs."""
+    get_log_store().invalidate(full=full)
@@ -0,0 +1,157 @@
+"""
+In-process backend for self-hosted single-node deployments (BACKEND_MODE=embedded):
+the /get_all_logs, /log, /predict_mood and /reset_logs operations run against a
+local SQLite database instead of the HTTP API.
+
+The logs table is keyed and clustered by date, so `since` queries are index range
+scans and saving a day that already exists replaces it (upsert by date).
+"""
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from utils.backend import BackendUnavailable
+from utils.data import SAMPLE_LOGS_FILE
+from utils.ingest import CompactBuilder
+from utils.lexicon import classify_mood
+from utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Embedded backend config ---
+EMBEDDED_DB_FILE = os.getenv("EMBEDDED_DB_FILE", "data/mindtrack.db")
+
+HABIT_COLUMNS = ("exercise", "water", "reading", "meditation")
+COLUMNS = ("date",) + HABIT_COLUMNS + ("mood", "journal_text")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    date TEXT PRIMARY KEY,
+    exercise INTEGER NOT NULL DEFAULT 0,
+    water INTEGER NOT NULL DEFAULT 0,
+    reading INTEGER NOT NULL DEFAULT 0,
+    meditation INTEGER NOT NULL DEFAULT 0,
+    mood TEXT,
+    journal_text TEXT
+) WITHOUT ROWID
+"""
+
+_UPSERT = (
+    f"INSERT INTO logs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+    f"ON CONFLICT(date) DO UPDATE SET "
+    + ", ".join(f"{col} = excluded.{col}" for col in COLUMNS[1:])
+)
+
+
+def _flag(value):
+    if isinstance(value, str):
+        return 0 if value.strip().lower() in ("", "0", "0.0", "false") else 1
+    return 1 if value else 0
+
+
+def _row(entry):
+    """Log dict -> row tuple in COLUMNS order (habits as 0/1)."""
+    if not entry.get("date"):
+        raise ValueError("A log entry needs a date")
+    return (
+        str(entry["date"])[:10],
+        *(_flag(entry.get(habit)) for habit in HABIT_COLUMNS),
+        entry.get("mood") or None,
+        entry.get("journal_text") or None,
+    )
+
+
+class EmbeddedBackend:
+    """
+    Same interface as BackendClient, backed by SQLite. One connection is shared by
+    every session behind a lock; storage errors surface as BackendUnavailable so
+    callers handle them like an unreachable backend.
+    """
+
+    def __init__(self, path=EMBEDDED_DB_FILE, sample_file=SAMPLE_LOGS_FILE):
+        self.path = path
+        self.sample_file = sample_file
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._transaction() as conn:
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs'"
+            ).fetchone()
+            conn.execute(_SCHEMA)
+            if not exists: # A new database starts with the sample data, like the hosted backend
+                self._load_sample(conn)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            try:
+                with self._conn: # Commits, or rolls back on error
+                    yield self._conn
+            except sqlite3.Error as e:
+                raise BackendUnavailable(f"Embedded store error: {e}") from e
+
+    def _load_sample(self, conn):
+        try:
+            with open(self.sample_file, newline="", encoding="utf-8") as f:
+                rows = [_row(entry) for entry in csv.DictReader(f)]
+        except FileNotFoundError:
+            logger.warning("Sample file not found at %s, starting empty", self.sample_file)
+            return
+        conn.executemany(_UPSERT, rows)
+
+    # --- Endpoints ---
+
+    def get_all_logs(self, since=None):
+        query = f"SELECT {', '.join(COLUMNS)} FROM logs"
+        params = ()
+        if since:
+            query += " WHERE date >= ?"
+            params = (since,)
+        with self._transaction() as conn:
+            rows = conn.execute(query + " ORDER BY date", params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def stream_logs(self, since=None, journals=True):
+        """Rows go from the cursor straight into the compact schema; see BackendClient.stream_logs."""
+        columns = COLUMNS if journals else COLUMNS[:-1]
+        query = f"SELECT {', '.join(columns)} FROM logs"
+        params = ()
+        if since:
+            query += " WHERE date >= ?"
+            params = (since,)
+        builder = CompactBuilder(journals=journals)
+        with self._transaction() as conn:
+            for row in conn.execute(query + " ORDER BY date", params):
+                builder.add(dict(zip(columns, row)))
+        return builder.build()
+
+    def save_log(self, entry):
+        with self._transaction() as conn:
+            conn.execute(_UPSERT, _row(entry))
+
+    def save_logs(self, entries):
+        """Upserts many entries in one transaction."""
+        rows = [_row(entry) for entry in entries]
+        with self._transaction() as conn:
+            conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def predict_mood(self, text):
+        """Predicts with the local lexicon classifier (utils.lexicon)."""
+        return classify_mood(text).label
+
+    def reset_logs(self):
+        """Deletes every log and reloads the sample data."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM logs")
+            self._load_sample(conn)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,125 @@
+import os
+
+import pandas as pd
+
+from utils.mood import PENDING_MOOD
+from utils.schema import HABITS
+from utils.streaks import compute_streaks
+
+# Approximate prompt budget for the history block (1 token ≈ 4 characters)
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+CHARS_PER_TOKEN = 4
+
+SNIPPET_CHARS = 160 # Max characters kept per journal entry
+MAX_WEEKS = 26 # Mood weeks considered before trimming to budget
+MAX_RUNS = 5 # Recent streak runs listed
+
+
+def estimate_tokens(text):
+    """Rough token count for budgeting (no tokenizer dependency)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _prepare(records):
+    logs = pd.DataFrame(records)
+    if logs.empty or "date" not in logs.columns:
+        return pd.DataFrame(columns=["date"])
+    logs["date"] = pd.to_datetime(logs["date"], errors="coerce")
+    logs = logs.dropna(subset=["date"]).drop_duplicates(subset=["date"], keep="last")
+    for habit in HABITS:
+        if habit in logs.columns:
+            logs[habit] = pd.to_numeric(logs[habit], errors="coerce").fillna(0)
+    return logs.sort_values(by="date", ignore_index=True)
+
+
+def _overview_lines(logs):
+    first, last = logs["date"].iloc[0].date(), logs["date"].iloc[-1].date()
+    lines = [f"Logged days: {len(logs)} ({first} to {last})"]
+
+    habits = [h for h in HABITS if h in logs.columns]
+    recent = logs[logs["date"] > logs["date"].iloc[-1] - pd.Timedelta(days=30)]
+    lines.append("Habit completion rate (all time | last 30 days):")
+    for habit in habits:
+        lines.append(f"- {habit}: {logs[habit].mean():.0%} | {recent[habit].mean():.0%}")
+
+    streaks = compute_streaks(logs["date"].dt.date)
+    runs = ", ".join(f"{r.start}..{r.end} ({r.length}d)" for r in streaks.runs[-MAX_RUNS:])
+    lines.append(f"Streaks: current {streaks.current}d, longest {streaks.longest}d; recent runs: {runs}")
+    return lines
+
+
+def _mood_week_lines(logs):
+    if "mood" not in logs.columns:
+        return []
+    moods = logs[logs["mood"].notna() & (logs["mood"] != PENDING_MOOD)]
+    if moods.empty:
+        return []
+    weekly = pd.crosstab(moods["date"].dt.to_period("W").dt.start_time.dt.date, moods["mood"])
+    weekly = weekly.tail(MAX_WEEKS)
+    header = "week," + ",".join(weekly.columns)
+    rows = [f"{week},{','.join(str(n) for n in counts)}" for week, counts in zip(weekly.index, weekly.values)]
+    return [header] + rows
+
+
+def _snippet_lines(logs):
+    """Yields one line per journal entry, most recent first (lazily, so trimming stops early)."""
+    if "journal_text" not in logs.columns:
+        return
+    has_mood = "mood" in logs.columns
+    for i in range(len(logs) - 1, -1, -1):
+        text = logs["journal_text"].iat[i]
+        text = " ".join(text.split()) if isinstance(text, str) else ""
+        if not text:
+            continue
+        if len(text) > SNIPPET_CHARS:
+            text = text[:SNIPPET_CHARS - 1] + "…"
+        mood = logs["mood"].iat[i] if has_mood else None
+        mood = mood if isinstance(mood, str) else "?"
+        yield f"{logs['date'].iat[i].date()} | {mood} | {text}"
+
+
+def _fit(lines, budget_chars, keep="last"):
+    """Keeps as many lines as fit in `budget_chars`, from the start or the end of `lines`."""
+    kept, used = [], 0
+    ordered = lines if keep == "first" else reversed(list(lines))
+    for line in ordered:
+        if used + len(line) + 1 > budget_chars:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return kept if keep == "first" else kept[::-1]
+
+
+def summarize_history(records, token_budget=HISTORY_TOKEN_BUDGET):
+    """
+    Builds a compact text summary of the log history for the LLM prompt: overall
+    and recent habit rates, streak runs, mood counts per week (columnar) and the
+    most recent journal snippets, trimmed to fit `token_budget`.
+    Its size depends on the budget, not on how long the history is.
+    """
+    logs = _prepare(records)
+    if logs.empty:
+        return "No logs yet."
+
+    budget = token_budget * CHARS_PER_TOKEN
+    overview = "\n".join(_overview_lines(logs))
+    budget -= len(overview)
+
+    sections = [overview]
+
+    # Weekly moods get up to 40% of what's left, journal snippets the rest
+    week_lines = _mood_week_lines(logs)
+    if week_lines:
+        header = "Mood counts per week (oldest to newest):"
+        rows = _fit(week_lines[1:], int(budget * 0.4) - len(header) - len(week_lines[0]) - 2)
+        if rows:
+            block = "\n".join([header, week_lines[0]] + rows)
+            sections.append(block)
+            budget -= len(block) + 2
+
+    header = "Recent journal entries (date | mood | text):"
+    snippets = _fit(_snippet_lines(logs), budget - len(header) - 2, keep="first")
+    if snippets:
+        sections.append("\n".join([header] + snippets))
+
+    return "\n\n".join(sections)
@@ -0,0 +1,168 @@
+"""
+Streaming ingestion of /get_all_logs: the JSON array is decoded one entry at a time
+as the response arrives, and each entry goes straight into typed column buffers.
+Neither the whole payload nor a list of dicts is ever held in memory, and journal
+texts are only kept when asked for.
+
+stream_compact(chunks) returns the same (frame, journals) as
+utils.schema.to_compact(json.loads(b"".join(chunks))).
+"""
+import codecs
+import json
+import re
+from array import array
+from datetime import date
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from utils.logs import get_logger
+from utils.schema import HABITS, empty_compact
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s*")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def iter_json_array(chunks):
+    """
+    Yields the items of a JSON array whose bytes arrive in `chunks` (any sizes, split
+    anywhere, including inside a UTF-8 character). Raises ValueError if the input is
+    not a JSON array or ends before the array is closed.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos = "", 0
+    opened = False
+
+    for chunk in chain(chunks, [None]): # None: end of input
+        final = chunk is None
+        buffer = buffer[pos:] + utf8.decode(chunk or b"", final=final)
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if not opened:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buffer[pos:pos + 20]!r}")
+                opened = True
+                pos += 1
+            elif char == "]":
+                return
+            elif char == ",":
+                pos += 1
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise ValueError(f"Malformed JSON array: {e}") from e
+                    break # Incomplete item: wait for the next chunk
+                if end == len(buffer) and not final and not isinstance(item, (dict, list)):
+                    break # A number or literal may continue in the next chunk
+                yield item
+                pos = end
+
+    raise ValueError("Truncated JSON array" if opened else "Empty response, expected a JSON array")
+
+
+def _day(value):
+    """Day ordinal (days since 1970-01-01) of a date string, or None if it can't be parsed."""
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10]).toordinal() - _EPOCH_ORDINAL
+        except ValueError:
+            pass
+    parsed = pd.to_datetime(value, errors="coerce", format="mixed") # Rare non-ISO dates
+    if parsed is None or pd.isna(parsed):
+        return None
+    return parsed.date().toordinal() - _EPOCH_ORDINAL
+
+
+def _done(value):
+    """Same rule as to_compact: a habit is done if its value is a number > 0."""
+    if isinstance(value, (int, float)):
+        return value > 0
+    if isinstance(value, str):
+        try:
+            return float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class CompactBuilder:
+    """
+    Accumulates log entries into the compact schema (see utils.schema) using typed
+    buffers: day int32, habits uint8 and mood category codes. With journals=False,
+    journal texts are dropped as soon as they are read.
+    """
+
+    def __init__(self, journals=True):
+        self.keep_journals = journals
+        self._days = array("i")
+        self._habits = array("B")
+        self._moods = array("h") # index into self._categories, -1 = no mood
+        self._categories = {}
+        self.journals = {}
+        self.invalid = 0
+
+    def add(self, entry):
+        day = _day(entry.get("date")) if isinstance(entry, dict) else None
+        if day is None:
+            self.invalid += 1
+            return
+
+        bits = 0
+        for i, habit in enumerate(HABITS):
+            if _done(entry.get(habit)):
+                bits |= 1 << i
+        mood = entry.get("mood")
+
+        self._days.append(day)
+        self._habits.append(bits)
+        self._moods.append(self._categories.setdefault(mood, len(self._categories)) if isinstance(mood, str) else -1)
+
+        if self.keep_journals: # Last entry for a day wins, as in to_compact
+            text = entry.get("journal_text")
+            if isinstance(text, str) and text:
+                self.journals[day] = text
+            else:
+                self.journals.pop(day, None)
+
+    def __len__(self):
+        return len(self._days)
+
+    def build(self):
+        """Returns (frame, journals), deduplicated by day (last wins) and sorted."""
+        if self.invalid:
+            logger.warning("Skipping %d logs with an invalid date", self.invalid)
+        if not self._days:
+            return empty_compact(), self.journals
+
+        # Sorted categories, like pd.Categorical(values) in to_compact
+        categories = sorted(self._categories, key=self._categories.get)
+        order = sorted(range(len(categories)), key=categories.__getitem__)
+        remap = np.full(len(categories) + 1, -1, dtype=np.int16)
+        remap[order] = np.arange(len(categories), dtype=np.int16)
+        codes = remap[np.frombuffer(self._moods, dtype=np.int16)] # -1 indexes the trailing -1
+
+        frame = pd.DataFrame({
+            "day": np.frombuffer(self._days, dtype=np.intc).astype(np.int32),
+            "habits": np.frombuffer(self._habits, dtype=np.uint8).copy(),
+            "mood": pd.Categorical.from_codes(codes, categories=sorted(categories)),
+        })
+        last = ~frame["day"].duplicated(keep="last").to_numpy()
+        return frame[last].sort_values(by="day", ignore_index=True), self.journals
+
+
+def stream_compact(chunks, journals=True):
+    """Parses a /get_all_logs JSON body arriving in byte `chunks` into (frame, journals)."""
+    builder = CompactBuilder(journals=journals)
+    for entry in iter_json_array(chunks):
+        builder.add(entry)
+    return builder.build()
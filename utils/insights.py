@@ -0,0 +1,36 @@
+import hashlib
+import os
+import time
+
+import streamlit as st
+
+from utils.cache import PersistentLRUCache
+
+# --- Insight cache config ---
+INSIGHT_CACHE_FILE = os.getenv("INSIGHT_CACHE_FILE", "data/insight_cache.json")
+INSIGHT_CACHE_SIZE = int(os.getenv("INSIGHT_CACHE_SIZE", "200"))
+
+
+def prompt_version(template, model):
+    """Short id of the prompt template and model; changes whenever either does."""
+    return hashlib.sha256(f"{model}\0{template}".encode("utf-8")).hexdigest()[:12]
+
+
+def history_fingerprint(history_summary, version):
+    """Cache key for an insight: the summarized history plus the prompt version."""
+    return hashlib.sha256(f"{version}\0{history_summary}".encode("utf-8")).hexdigest()
+
+
+@st.cache_resource
+def get_insight_cache():
+    """Persistent cache of generated insights, shared by every session."""
+    return PersistentLRUCache(INSIGHT_CACHE_FILE, max_entries=INSIGHT_CACHE_SIZE)
+
+
+def get_cached_insight(cache, fingerprint):
+    """Returns the stored insight dict ({text, created_at}) or None."""
+    return cache.get(fingerprint)
+
+
+def store_insight(cache, fingerprint, text):
+    cache.put(fingerprint, {"text": text, "created_at": time.time()})
@@ -0,0 +1,104 @@
+"""
+Small on-box mood classifier: a word lexicon scored over batches of journal texts.
+It returns the same labels as the backend model and is used as a fallback when
+/predict_mood is slow or down, and as a shortcut for obvious cases (see utils.mood).
+"""
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+MOODS = ("Happy", "Neutral", "Sad", "Angry")
+
+_LEXICON = {
+    "Happy": (
+        "happy great good proud accomplished productive energetic energized rejuvenated "
+        "rejuvinated joy joyful excited grateful thankful love loved awesome amazing fantastic "
+        "wonderful fun glad motivated relaxed refreshed improve improved progress success "
+        "successful smile smiled cheerful delighted peaceful calm focus focused best nice positive"
+    ),
+    "Neutral": (
+        "average okay ok fine normal usual ordinary guess balanced routine regular meh "
+        "alright nothing mixed same uneventful"
+    ),
+    "Sad": (
+        "sad low tired lonely alone depressed down broke broken cry cried crying miss missed "
+        "hurt hopeless exhausted unhappy worthless gloomy grief lost empty anxious anxiety "
+        "stressed stress overwhelmed drained sick heartbroken disappointed bad worse worst"
+    ),
+    "Angry": (
+        "angry anger mad furious annoyed annoying irritated frustrated frustrating hate hated "
+        "rage pissed unfair yelled shouted argument argued fight fought disgusted livid"
+    ),
+}
+
+# A negation flips the mood of every word after it up to the end of its clause
+_NEGATIONS = frozenset(
+    "not no never cannot cant can't couldnt couldn't dont don't didnt didn't wasnt wasn't "
+    "isnt isn't wont won't without hardly".split()
+)
+_CLAUSE_BREAKS = frozenset([*".,;:!?", "but"])
+_NEGATED = {"Happy": "Sad", "Neutral": "Neutral", "Sad": "Neutral", "Angry": "Neutral"}
+
+_TOKEN_RE = re.compile(r"[a-z']+|[.,;:!?]")
+
+_WORD_MOOD = {word: MOODS.index(mood) for mood, words in _LEXICON.items() for word in words.split()}
+_NEGATED_INDEX = np.array([MOODS.index(_NEGATED[mood]) for mood in MOODS])
+
+
+class MoodPrediction(NamedTuple):
+    label: str
+    confidence: float # share of the lexicon hits that agree with `label` (0 when undecided)
+    hits: int # number of lexicon words found
+    margin: int = 0 # hits for `label` minus hits for the runner-up mood (0 when undecided)
+
+
+def _hits(text):
+    """Mood index of every lexicon word in `text`, negations applied."""
+    moods = []
+    negated = False
+    for token in _TOKEN_RE.findall(text.casefold()):
+        if token in _CLAUSE_BREAKS:
+            negated = False
+        elif token in _NEGATIONS:
+            negated = True
+        elif token in _WORD_MOOD:
+            mood = _WORD_MOOD[token]
+            moods.append(_NEGATED_INDEX[mood] if negated else mood)
+    return moods
+
+
+def classify_moods(texts):
+    """
+    Classifies a batch of journal texts. Hits are tallied into one (texts x moods)
+    count matrix, and labels and confidences come from vectorized ops over it.
+    Texts without any lexicon word, or with a tie, are Neutral.
+    """
+    texts = list(texts)
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        moods = _hits(text or "")
+        rows.extend([row] * len(moods))
+        cols.extend(moods)
+
+    counts = np.zeros((len(texts), len(MOODS)), dtype=np.int32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1)
+
+    totals = counts.sum(axis=1)
+    ranked = np.sort(counts, axis=1)
+    top, runner_up = ranked[:, -1], ranked[:, -2]
+    # No hits at all, or a tie between moods, means Neutral
+    undecided = (totals == 0) | (top == runner_up)
+    labels = np.where(undecided, MOODS.index("Neutral"), counts.argmax(axis=1))
+    confidence = np.divide(top, totals, out=np.zeros(len(texts)), where=~undecided)
+    margin = np.where(undecided, 0, top - runner_up)
+
+    return [
+        MoodPrediction(MOODS[label], float(conf), int(hits), int(lead))
+        for label, conf, hits, lead in zip(labels, confidence, totals, margin)
+    ]
+
+
+def classify_mood(text):
+    """Classifies a single journal text (see classify_moods)."""
+    return classify_moods([text])[0]
@@ -0,0 +1,186 @@
+"""
+Columnar on-disk copy of the logs, read with a memory map instead of a CSV parse.
+
+Layout of a store directory:
+    logs.bin        fixed-width records (day int32, habits uint8, mood int8), append-only
+    moods.json      mood category list; a record's mood is an index into it (-1 = none)
+    journals.jsonl  {"day": ..., "text": ...} lines, read only when journals are asked for
+
+Appending a day that already exists adds a new record; the last one wins on load.
+
+CSV import/export (run from the project root):
+    python -m utils.localstore import data/sample_logs.csv [--store DIR]
+    python -m utils.localstore export out.csv [--store DIR]
+"""
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import empty_compact, to_compact, to_records
+
+MIRROR_DIR = os.getenv("LOCAL_STORE_DIR", "data/local_store") # Persistent mirror of backend data
+SAMPLE_STORE_DIR = "data/sample_store" # sample_logs.csv, converted once
+
+RECORD_DTYPE = np.dtype([("day", "<i4"), ("habits", "u1"), ("mood", "i1")])
+
+
+class LocalLogStore:
+    """Append-only columnar log file plus sidecar files, see module docstring."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    # --- Mood categories ---
+
+    def _read_moods(self):
+        try:
+            with open(self._path("moods.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _write_json(self, name, value):
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, self._path(name))
+
+    def _encode(self, frame, moods):
+        """Frame -> record array; extends `moods` in place with unseen categories."""
+        codes = np.full(len(frame), -1, dtype=np.int8)
+        for i, mood in enumerate(frame["mood"].to_numpy()):
+            if isinstance(mood, str):
+                if mood not in moods:
+                    moods.append(mood)
+                codes[i] = moods.index(mood)
+        records = np.empty(len(frame), dtype=RECORD_DTYPE)
+        records["day"] = frame["day"].to_numpy()
+        records["habits"] = frame["habits"].to_numpy()
+        records["mood"] = codes
+        return records
+
+    def _write_journals(self, journals, mode):
+        with open(self._path("journals.jsonl"), mode, encoding="utf-8") as f:
+            for day, text in journals.items():
+                f.write(json.dumps({"day": int(day), "text": text}) + "\n")
+
+    # --- Public API ---
+
+    def exists(self):
+        return os.path.exists(self._path("logs.bin"))
+
+    def load(self):
+        """Returns the stored logs as a compact frame (see utils.schema), via a memory map."""
+        with self._lock:
+            path = self._path("logs.bin")
+            if not os.path.exists(path) or os.path.getsize(path) < RECORD_DTYPE.itemsize:
+                return empty_compact()
+            count = os.path.getsize(path) // RECORD_DTYPE.itemsize # Ignore a torn last record
+            records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+            moods = self._read_moods()
+
+        # Last record per day wins, then sort by day
+        days = records["day"]
+        _, last_from_end = np.unique(days[::-1], return_index=True)
+        keep = np.sort(len(days) - 1 - last_from_end)
+        records = records[keep]
+        records = records[np.argsort(records["day"], kind="stable")]
+
+        return pd.DataFrame({
+            "day": records["day"].astype(np.int32),
+            "habits": records["habits"].astype(np.uint8),
+            "mood": pd.Categorical.from_codes(records["mood"].astype(np.int16), categories=moods),
+        })
+
+    def journals(self):
+        """Reads the journal texts (day -> text). Only called when journals are needed."""
+        texts = {}
+        try:
+            with open(self._path("journals.jsonl"), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    texts[entry["day"]] = entry["text"]
+        except FileNotFoundError:
+            pass
+        return texts
+
+    def append(self, frame, journals=None):
+        """Appends compact rows (and their journals) to the store."""
+        if frame.empty and not journals:
+            return
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            moods = self._read_moods()
+            records = self._encode(frame, moods)
+            self._write_json("moods.json", moods)
+            with open(self._path("logs.bin"), "ab") as f:
+                f.write(records.tobytes())
+            if journals:
+                self._write_journals(journals, "a")
+
+    def replace(self, frame, journals=None):
+        """
+        Atomically replaces the whole store with `frame` (e.g. after a full backend reload).
+        journals=None keeps the stored journal texts as they are.
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            moods = []
+            records = self._encode(frame, moods)
+            self._write_json("moods.json", moods)
+            tmp_path = self._path("logs.bin.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(records.tobytes())
+            os.replace(tmp_path, self._path("logs.bin"))
+            if journals is not None:
+                self._write_journals(journals, "w")
+
+    def import_csv(self, path):
+        """Replaces the store with the logs from a CSV in the backend/sample shape."""
+        frame, journals = to_compact(pd.read_csv(path))
+        self.replace(frame, journals)
+        return len(frame)
+
+    def export_csv(self, path):
+        """Writes the stored logs (with journals) to a CSV in the backend/sample shape."""
+        records = to_records(self.load(), self.journals())
+        columns = ["date", "exercise", "water", "reading", "meditation", "mood", "journal_text"]
+        pd.DataFrame(records, columns=columns).to_csv(path, index=False)
+        return len(records)
+
+
+def open_sample_store(csv_path):
+    """The sample logs as a local store, converted from CSV only the first time."""
+    store = LocalLogStore(SAMPLE_STORE_DIR)
+    if not store.exists() or os.path.getmtime(csv_path) > os.path.getmtime(store._path("logs.bin")):
+        store.import_csv(csv_path)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/export the local columnar log store.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("csv_path")
+    parser.add_argument("--store", default=MIRROR_DIR, help=f"store directory (default {MIRROR_DIR})")
+    args = parser.parse_args()
+
+    store = LocalLogStore(args.store)
+    if args.command == "import":
+        print(f"Imported {store.import_csv(args.csv_path)} logs into {args.store}")
+    else:
+        print(f"Exported {store.export_csv(args.csv_path)} logs to {args.csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+# --- Logging config ---
+LOGGER_NAME = "mindtrack" # Every app logger lives under this name
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_CHARS = int(os.getenv("LOG_MAX_CHARS", "500")) # Longer messages are truncated
+# At most LOG_RATE_LIMIT records per message template and LOG_RATE_WINDOW seconds
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+LOG_RATE_WINDOW = float(os.getenv("LOG_RATE_WINDOW", "60"))
+
+_configure_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `limit` records per (logger, message template) in each
+    `window` seconds. The first record after a suppressed stretch reports how many
+    were dropped. Warnings and errors are limited too: a down backend fails every rerun.
+    """
+
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW, clock=time.monotonic):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets = {} # key -> [window start, records let through, records dropped]
+
+    def filter(self, record):
+        if not getattr(record, "rate_limit", True): # Opted out with extra={"rate_limit": False}
+            return True
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg).__name__)
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or now - bucket[0] >= self.window:
+                dropped = bucket[2] if bucket else 0
+                bucket = self._buckets[key] = [now, 0, 0]
+                if dropped:
+                    record.suppressed = dropped
+            if bucket[1] >= self.limit:
+                bucket[2] += 1
+                return False
+            bucket[1] += 1
+            return True
+
+
+class BoundedFormatter(logging.Formatter):
+    """Truncates long messages (e.g. exception texts carrying a response body) to `max_chars`."""
+
+    def __init__(self, fmt=None, max_chars=LOG_MAX_CHARS):
+        super().__init__(fmt)
+        self.max_chars = max_chars
+
+    def formatMessage(self, record):
+        message = record.message
+        if len(message) > self.max_chars:
+            record.message = f"{message[:self.max_chars]}… [{len(message)} chars]"
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            record.message += f" (+{suppressed} similar suppressed)"
+        try:
+            return super().formatMessage(record)
+        finally:
+            record.message = message
+
+
+def configure_logging(level=LOG_LEVEL, stream=None):
+    """Sets up the app's log handler once per process (later calls are no-ops)."""
+    root = logging.getLogger(LOGGER_NAME)
+    with _configure_lock:
+        if root.handlers:
+            return root
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(BoundedFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handler.addFilter(RateLimitFilter())
+        root.addHandler(handler)
+        root.setLevel(level)
+        root.propagate = False # Streamlit configures the root logger its own way
+    return root
+
+
+def get_logger(name):
+    """Returns the app logger for a module (pass __name__), configuring logging on first use."""
+    configure_logging()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def payload_summary(rows=None, nbytes=None, latency_ms=None):
+    """Describes a payload by size instead of content, e.g. 'rows=714 bytes=118.2KB latency_ms=9.9'."""
+    parts = []
+    if rows is not None:
+        parts.append(f"rows={rows}")
+    if nbytes is not None:
+        parts.append(f"bytes={nbytes / 1024:.1f}KB" if nbytes >= 1024 else f"bytes={nbytes}")
+    if latency_ms is not None:
+        parts.append(f"latency_ms={latency_ms:.1f}")
+    return " ".join(parts)
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+
+from utils.backend import get_backend_client
+from utils.cache import PersistentLRUCache
+from utils.lexicon import classify_mood
+from utils.logs import get_logger
+from utils.outbox import get_outbox_flusher
+
+logger = get_logger(__name__)
+
+# --- Mood prediction config ---
+# "async": save the log right away with a pending mood and predict in the background
+# "sync": predict first, then save (the original flow)
+MOOD_PREDICTION_MODE = os.getenv("MOOD_PREDICTION_MODE", "async")
+
+PENDING_MOOD = "Pending" # Stored mood while the prediction is running
+PENDING_MOOD_LABEL = "Analyzing…" # How the dashboard shows it
+
+# Bump MOOD_MODEL_VERSION when the backend model changes to invalidate cached predictions
+MOOD_MODEL_VERSION = os.getenv("MOOD_MODEL_VERSION", "1")
+MOOD_CACHE_FILE = os.getenv("MOOD_CACHE_FILE", "data/mood_cache.json")
+MOOD_CACHE_SIZE = int(os.getenv("MOOD_CACHE_SIZE", "2000"))
+
+# Local lexicon classifier (utils.lexicon): answers on its own only on strong evidence,
+# i.e. enough hits, this share of them agreeing and a clear lead over the runner-up mood
+# (set MOOD_LOCAL_CONFIDENCE above 1 to always ask the backend), and stands in when
+# the backend fails unless MOOD_LOCAL_FALLBACK=0
+MOOD_LOCAL_CONFIDENCE = float(os.getenv("MOOD_LOCAL_CONFIDENCE", "0.9"))
+MOOD_LOCAL_MIN_HITS = int(os.getenv("MOOD_LOCAL_MIN_HITS", "3"))
+MOOD_LOCAL_MIN_MARGIN = int(os.getenv("MOOD_LOCAL_MIN_MARGIN", "3"))
+MOOD_LOCAL_FALLBACK = os.getenv("MOOD_LOCAL_FALLBACK", "1").lower() not in ("0", "false", "no")
+
+
+# --- Prediction cache ---
+
+def journal_cache_key(text, model_version=MOOD_MODEL_VERSION):
+    """Hash of the normalized journal text (case and whitespace ignored) and model version."""
+    normalized = re.sub(r"\s+", " ", text).strip().casefold()
+    return hashlib.sha256(f"{model_version}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+@st.cache_resource
+def get_prediction_cache():
+    """The persistent mood prediction cache, with entries from other model versions dropped."""
+    cache = PersistentLRUCache(MOOD_CACHE_FILE, max_entries=MOOD_CACHE_SIZE)
+    cache.discard_where(lambda value: value.get("model_version") != MOOD_MODEL_VERSION)
+    return cache
+
+
+def is_confident(local):
+    """True if a local MoodPrediction is strong enough to skip the backend."""
+    return (
+        local.hits >= MOOD_LOCAL_MIN_HITS
+        and local.margin >= MOOD_LOCAL_MIN_MARGIN
+        and local.confidence >= MOOD_LOCAL_CONFIDENCE
+    )
+
+
+def predict_mood(client, cache, text):
+    """
+    Returns the mood for `text`: from the cache, from the local classifier when it
+    is confident, otherwise from the backend (only backend answers are cached). If the
+    backend call fails, the local classifier's label is used instead.
+    """
+    key = journal_cache_key(text)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["mood"]
+
+    local = classify_mood(text)
+    if is_confident(local):
+        return local.label
+
+    try:
+        mood = client.predict_mood(text)
+    except requests.exceptions.RequestException as e:
+        if not MOOD_LOCAL_FALLBACK:
+            raise
+        logger.warning("Mood prediction failed, using the local classifier (%s): %s", local.label, e)
+        return local.label
+    cache.put(key, {"mood": mood, "model_version": MOOD_MODEL_VERSION})
+    return mood
+
+
+@st.cache_resource
+def get_mood_executor():
+    """Worker pool for background mood predictions, shared by the whole process."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="mood-predict")
+
+
+def _predict_and_patch(client, cache, flusher, entry):
+    """Predicts the mood for a queued entry and re-queues it with the result."""
+    try:
+        mood = predict_mood(client, cache, entry.get("journal_text") or "")
+    except requests.exceptions.RequestException as e:
+        # The entry stays saved with the pending mood; retried when the flusher next starts
+        logger.warning("Background mood prediction failed for %s: %s", entry['date'], e)
+        return None
+
+    flusher.outbox.enqueue({**entry, "mood": mood}) # Same date: replaces the pending version
+    flusher.wake()
+    return mood
+
+
+def _log_crash(future):
+    """Done-callback: nobody waits on background mood tasks, so report their crashes here."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background mood task crashed", exc_info=future.exception())
+
+
+def _submit_prediction(executor, client, cache, flusher, entry):
+    future = executor.submit(_predict_and_patch, client, cache, flusher, entry)
+    future.add_done_callback(_log_crash)
+    return future
+
+
+def submit_log_with_pending_mood(entry):
+    """
+    Queues `entry` immediately with a pending mood and predicts the real mood in a
+    worker thread, patching the entry once the prediction returns.
+    Returns the prediction future.
+    """
+    flusher = get_outbox_flusher()
+    pending_entry = {**entry, "mood": PENDING_MOOD}
+    flusher.outbox.enqueue(pending_entry)
+    flusher.wake()
+    return _submit_prediction(
+        get_mood_executor(), get_backend_client(), get_prediction_cache(), flusher, pending_entry
+    )
+
+
+# --- Recovery ---
+
+def pending_mood_entries(outbox, store):
+    """
+    Entries still saved with the pending mood, in the outbox or already synced to the
+    backend (e.g. the process stopped mid-prediction). One per date; the outbox wins.
+    """
+    by_date = {}
+    try:
+        by_date.update((r["date"], r) for r in store.records() if r.get("mood") == PENDING_MOOD)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Can't check synced logs for pending moods: %s", e)
+    by_date.update((entry["date"], entry) for entry in outbox.pending())
+    return [entry for _, entry in sorted(by_date.items()) if entry.get("mood") == PENDING_MOOD]
+
+
+def recover_pending_moods(executor, client, cache, flusher, store):
+    """Re-submits a prediction for every entry left with the pending mood. Returns how many."""
+    entries = pending_mood_entries(flusher.outbox, store)
+    for entry in entries:
+        _submit_prediction(executor, client, cache, flusher, entry)
+    if entries:
+        logger.info("Re-submitted %d pending mood predictions", len(entries))
+    return len(entries)
+
+
+def start_mood_recovery(flusher, store):
+    """
+    Runs recover_pending_moods in the background. Called on the script thread when the
+    flusher starts, so the shared resources are looked up here.
+    """
+    executor = get_mood_executor()
+    future = executor.submit(
+        recover_pending_moods, executor, get_backend_client(), get_prediction_cache(), flusher, store
+    )
+    future.add_done_callback(_log_crash)
+    return future
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+import requests
+import streamlit as st
+
+from utils.backend import get_backend_client
+from utils.data import get_log_store
+from utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Outbox config ---
+OUTBOX_FILE = os.getenv("OUTBOX_FILE", "data/outbox.jsonl")
+FLUSH_INTERVAL = float(os.getenv("OUTBOX_FLUSH_INTERVAL", "15"))
+
+# Rewrite the file without acknowledged records once this many have piled up
+COMPACT_AFTER = 200
+# Rejected entries kept (for display) when the file is rewritten
+DEAD_LETTERS_KEPT = 50
+# 4xx answers that mean "try again later" rather than "this entry is invalid"
+RETRYABLE_STATUS = {408, 429}
+
+
+def _rejected_status(error):
+    """The status code if the backend refused the entry itself (4xx), else None."""
+    response = getattr(error, "response", None)
+    if isinstance(error, requests.exceptions.HTTPError) and response is not None:
+        if 400 <= response.status_code < 500 and response.status_code not in RETRYABLE_STATUS:
+            return response.status_code
+    return None
+
+
+class Outbox:
+    """
+    Append-only local queue (JSONL) of log submissions.
+    Every submission is written here first; `flush()` sends pending entries to the
+    backend and appends an ack record for each one that was accepted. Entries the
+    backend rejects (4xx) are moved to a dead-letter record instead, so they don't
+    block the dates behind them. Several pending entries for the same date collapse
+    to the latest one.
+    """
+
+    def __init__(self, path=OUTBOX_FILE):
+        self.path = path
+        self._lock = threading.Lock() # Guards the file
+        self._flush_lock = threading.Lock()
+
+    # --- File access ---
+
+    def _append(self, record):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read(self):
+        """Returns (pending entries by id in queue order, number of acked records, dead letters)."""
+        pending, acked, dead = {}, 0, []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # Torn last line from a crash mid-write
+                    if record.get("op") == "log":
+                        pending[record["id"]] = record
+                    elif record.get("op") in ("ack", "dead"):
+                        for entry_id in record["ids"]:
+                            if pending.pop(entry_id, None) is not None:
+                                acked += 1
+                        if record["op"] == "dead":
+                            dead.append(record)
+        except FileNotFoundError:
+            pass
+        return pending, acked, dead
+
+    def _compact(self, pending, dead):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in dead[-DEAD_LETTERS_KEPT:] + list(pending.values()):
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    # --- Public API ---
+
+    def enqueue(self, entry):
+        """Durably stores a log entry for delivery. Returns its outbox id."""
+        record = {"op": "log", "id": uuid.uuid4().hex, "queued_at": time.time(), "entry": entry}
+        with self._lock:
+            self._append(record)
+        return record["id"]
+
+    def pending(self):
+        """Pending entries, one per date (latest submission wins), oldest date first."""
+        with self._lock:
+            records, _, _ = self._read()
+        by_date = {r["entry"]["date"]: r["entry"] for r in records.values()}
+        return [by_date[d] for d in sorted(by_date)]
+
+    def rejected(self):
+        """Dead-letter records ({"entry", "status", "error", ...}) of entries the backend refused, oldest first."""
+        with self._lock:
+            _, _, dead = self._read()
+        return dead
+
+    def flush(self, client):
+        """
+        Sends every pending entry to the backend over the client's pooled session.
+        Stops at the first connection error, timeout or 5xx (the rest stay queued); an
+        entry refused with a 4xx is dead-lettered and skipped. Returns how many were sent.
+        The file lock is only held to read and to record acks, never during a request,
+        so enqueue() and pending() don't wait for a slow backend.
+        """
+        with self._flush_lock: # One flush at a time, or entries could be sent twice
+            with self._lock:
+                records, _, _ = self._read()
+
+            # Dedupe by date: send the latest entry, ack every id it supersedes
+            ids_by_date = {}
+            for entry_id, record in records.items():
+                ids_by_date.setdefault(record["entry"]["date"], []).append(entry_id)
+
+            sent = 0
+            for log_date in sorted(ids_by_date):
+                ids = ids_by_date[log_date]
+                entry = records[ids[-1]]["entry"]
+                try:
+                    client.save_log(entry)
+                except requests.exceptions.RequestException as e:
+                    status = _rejected_status(e)
+                    if status is None: # Backend down, slow or failing: retry everything later
+                        logger.warning("Outbox flush stopped, %d dates still pending: %s", len(ids_by_date) - sent, e)
+                        break
+                    logger.error("Backend rejected the log for %s (HTTP %d), not retrying: %s", log_date, status, e)
+                    with self._lock:
+                        self._append({"op": "dead", "ids": ids, "status": status, "error": str(e),
+                                      "rejected_at": time.time(), "entry": entry})
+                    continue
+                with self._lock:
+                    self._append({"op": "ack", "ids": ids})
+                sent += 1
+
+            with self._lock: # Re-read: entries may have been queued meanwhile
+                records, acked, dead = self._read()
+                if acked >= COMPACT_AFTER:
+                    self._compact(records, dead)
+
+        return sent
+
+
+class OutboxFlusher(threading.Thread):
+    """Background thread that flushes the outbox on demand and every `interval` seconds."""
+
+    def __init__(self, outbox, client, interval=FLUSH_INTERVAL, on_flushed=None):
+        super().__init__(name="outbox-flusher", daemon=True)
+        self.outbox = outbox
+        self.client = client
+        self.interval = interval
+        self.on_flushed = on_flushed
+        self._wake = threading.Event()
+
+    def wake(self):
+        """Asks for a flush now instead of at the next interval."""
+        self._wake.set()
+
+    def run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                if self.outbox.flush(self.client) and self.on_flushed:
+                    self.on_flushed()
+            except Exception as e: # Never let the flusher die
+                logger.exception("Outbox flusher error: %s", e)
+
+
+@st.cache_resource
+def get_outbox_flusher():
+    """Starts (once per process) the flusher for the shared outbox."""
+    # Imported here: utils.mood and utils.prefetch (via utils.aggregates) import this module
+    from utils.mood import start_mood_recovery
+    from utils.prefetch import get_prefetcher, prefetch_dashboard
+
+    # Looked up here, on the script thread; on_flushed runs on the flusher thread
+    store, prefetcher = get_log_store(), get_prefetcher()
+
+    def on_flushed():
+        store.invalidate() # New entries reach the dashboard on next sync...
+        prefetch_dashboard(store, prefetcher) # ...which happens now, in the background
+
+    flusher = OutboxFlusher(Outbox(), get_backend_client(), on_flushed=on_flushed)
+    flusher.start()
+    flusher.wake() # Replay anything left over from a previous run
+    start_mood_recovery(flusher, store) # ...and finish predictions it didn't
+    return flusher
+
+
+def submit_log(entry):
+    """Queues a log entry and triggers a background flush. Returns immediately."""
+    flusher = get_outbox_flusher()
+    flusher.outbox.enqueue(entry)
+    flusher.wake()
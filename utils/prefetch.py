@@ -0,0 +1,92 @@
+"""
+Background warm-up of the Progress Dashboard.
+
+After a save reaches the backend (see utils.outbox) and once per session on the
+other pages, the shared LogStore is synced and everything the dashboard renders
+first (aggregates, default calendar, default trend) is computed on a background
+thread, so opening the dashboard only reads caches.
+
+Streamlit objects (the store, the prefetcher) are looked up on the calling script
+thread and handed to the worker; the worker itself never touches st.* lookups.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils.aggregates import load_dashboard_aggregates
+from utils.charts import TREND_RANGES, render_habit_calendar, trend_frame
+from utils.data import get_log_store
+from utils.logs import get_logger
+from utils.timing import stage
+
+logger = get_logger(__name__)
+
+# --- Prefetch config ---
+PREFETCH_ENABLED = os.getenv("PREFETCH_DASHBOARD", "1") != "0"
+PREFETCH_SESSION_KEY = "_dashboard_prefetched"
+
+
+class Prefetcher:
+    """
+    Runs warm-ups on a single background thread. While one is waiting to start,
+    further requests are merged into it; one may run while the next is queued.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._queued = False
+
+    def submit(self, fn, *args):
+        """Queues fn(*args). Returns the future, or None if merged into a queued run."""
+        with self._lock:
+            if self._queued:
+                return None
+            self._queued = True
+        return self._executor.submit(self._run, fn, args)
+
+    def _run(self, fn, args):
+        with self._lock:
+            self._queued = False # Requests from now on see data newer than this run
+        try:
+            fn(*args)
+        except Exception as e: # Best effort: the dashboard loads (and reports errors) itself
+            logger.warning("Dashboard prefetch failed: %s", e)
+
+
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher()
+
+
+def warm_dashboard(store):
+    """Syncs `store` and fills the caches behind the dashboard's default view."""
+    with stage("prefetch") as timed:
+        aggregates = load_dashboard_aggregates(store)
+        timed.set(days=aggregates.days_logged)
+        if not aggregates.days_logged:
+            return
+        totals, fingerprint = aggregates.daily_totals, aggregates.daily_fingerprint
+        # Same arguments as the dashboard's defaults: latest year, widest trend range
+        render_habit_calendar(fingerprint, totals, (int(totals.index.year.max()),))
+        trend_frame(fingerprint, totals, list(TREND_RANGES.values())[-1])
+
+
+def prefetch_dashboard(store=None, prefetcher=None):
+    """
+    Warms the dashboard in the background. Call from a script thread, or pass the
+    store and prefetcher obtained on one. Returns the future (None if skipped).
+    """
+    if not PREFETCH_ENABLED:
+        return None
+    return (prefetcher or get_prefetcher()).submit(warm_dashboard, store or get_log_store())
+
+
+def prefetch_on_start():
+    """Warms the dashboard once per session; call near the top of the non-dashboard pages."""
+    if st.session_state.get(PREFETCH_SESSION_KEY):
+        return
+    st.session_state[PREFETCH_SESSION_KEY] = True
+    prefetch_dashboard()
@@ -0,0 +1,209 @@
+"""
+Re-scores the mood of every stored journal, e.g. after the mood model changed.
+
+Journals are scored in chunks over a bounded worker pool, backend calls are
+rate-limited, changed moods are written back in bulk after each chunk, and
+finished dates are checkpointed so an interrupted run resumes where it stopped.
+
+Run from the project root:
+    python -m utils.rescore [--local] [--workers 4] [--rate 5] [--dry-run]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import requests
+
+from utils.lexicon import classify_moods
+from utils.logs import get_logger
+from utils.mood import MOOD_MODEL_VERSION
+
+logger = get_logger("utils.rescore") # Not __name__: this also runs as __main__
+
+# --- Re-scoring config ---
+CHECKPOINT_FILE = "data/rescore_checkpoint.json"
+CHUNK_SIZE = 50
+WORKERS = 4
+RATE = 5.0 # Backend /predict_mood calls per second, across all workers
+LOCAL_MODEL_VERSION = "lexicon-1"
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart, shared by every worker thread."""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+
+class RescoreStats(NamedTuple):
+    total: int # journals found
+    skipped: int # already done according to the checkpoint
+    scored: int
+    changed: int # written back with a new mood
+    failed: int # left for the next run
+
+
+# --- Scorers: list of texts -> list of moods (None where scoring failed) ---
+
+def backend_scorer(client, limiter):
+    def score(texts):
+        moods = []
+        for text in texts:
+            limiter.wait()
+            try:
+                moods.append(client.predict_mood(text))
+            except requests.exceptions.RequestException as e:
+                logger.warning("Mood prediction failed, will retry on the next run: %s", e)
+                moods.append(None)
+        return moods
+    return score
+
+
+def local_scorer(texts):
+    return [p.label for p in classify_moods(texts)]
+
+
+# --- Checkpoint ---
+
+def load_checkpoint(path, model_version):
+    """Dates already re-scored for `model_version` (a checkpoint for another version is ignored)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+    if checkpoint.get("model_version") != model_version:
+        return set()
+    return set(checkpoint.get("done", []))
+
+
+def save_checkpoint(path, model_version, done):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"model_version": model_version, "done": sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+
+# --- Job ---
+
+def _write_back(client, entries, limiter=None):
+    if hasattr(client, "save_logs"): # Embedded backend: one transaction
+        client.save_logs(entries)
+    else: # The HTTP API only has /log: one rate-limited call per entry
+        for entry in entries:
+            if limiter is not None:
+                limiter.wait()
+            client.save_log(entry)
+
+
+def rescore(client, score, model_version, checkpoint_path=CHECKPOINT_FILE,
+            chunk_size=CHUNK_SIZE, workers=WORKERS, dry_run=False, limiter=None):
+    """
+    Re-scores every journal from `client` with `score` and writes changed moods back.
+    At most `workers` chunks are scored at a time; writes (paced by `limiter`) and
+    checkpoints happen on the calling thread as chunks finish. If a write-back fails
+    the job stops, and everything not yet written is left for the next run.
+    Returns RescoreStats.
+    """
+    done = load_checkpoint(checkpoint_path, model_version)
+    logs = [log for log in client.get_all_logs() if log.get("journal_text")]
+    todo = [log for log in logs if log["date"] not in done]
+    chunks = (todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size))
+    scored = changed = failed = 0
+    stopped = False
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rescore") as pool:
+        in_flight = {}
+        while not stopped:
+            # Keep the pool busy without materializing every chunk's future at once
+            for chunk in chunks:
+                in_flight[pool.submit(score, [log["journal_text"] for log in chunk])] = chunk
+                if len(in_flight) >= workers:
+                    break
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = in_flight.pop(future)
+                if stopped: # Finished alongside the failed chunk: not written
+                    continue
+                moods = future.result()
+                updates = [
+                    {**log, "mood": mood} for log, mood in zip(chunk, moods)
+                    if mood is not None and mood != log.get("mood")
+                ]
+                if updates and not dry_run:
+                    try:
+                        _write_back(client, updates, limiter)
+                    except requests.exceptions.RequestException as e:
+                        logger.error("Writing re-scored moods failed, stopping: %s", e)
+                        stopped = True
+                        continue
+                ok = [log["date"] for log, mood in zip(chunk, moods) if mood is not None]
+                scored += len(ok)
+                failed += len(chunk) - len(ok)
+                changed += len(updates)
+                if not dry_run:
+                    done.update(ok)
+                    save_checkpoint(checkpoint_path, model_version, done)
+                logger.info("Re-scored %d/%d journals, %d changed", scored, len(todo), changed)
+
+        if stopped:
+            for future in in_flight:
+                future.cancel() # Queued chunks won't be written anyway
+
+    if stopped:
+        failed = len(todo) - scored # Left for the next run
+        logger.error("Stopped early, %d journals left for the next run", failed)
+    return RescoreStats(len(logs), len(logs) - len(todo), scored, changed, failed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score the mood of every stored journal.")
+    parser.add_argument("--local", action="store_true", help="use the local lexicon classifier instead of /predict_mood")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--rate", type=float, default=RATE, help="max /predict_mood calls per second")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and re-score everything")
+    parser.add_argument("--dry-run", action="store_true", help="score and report, but write nothing")
+    args = parser.parse_args(argv)
+
+    # Imported here: builds the configured backend (remote API or embedded store)
+    from utils.backend import get_backend_client
+    client = get_backend_client()
+
+    limiter = RateLimiter(args.rate) # Shared by /predict_mood calls and /log write-backs
+    if args.local:
+        score, model_version = local_scorer, LOCAL_MODEL_VERSION
+    else:
+        score, model_version = backend_scorer(client, limiter), MOOD_MODEL_VERSION
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    stats = rescore(client, score, model_version, args.checkpoint, args.chunk_size, args.workers, args.dry_run, limiter)
+    print(f"{stats.total} journals: {stats.skipped} already done, {stats.scored} scored, "
+          f"{stats.changed} changed{' (dry run)' if args.dry_run else ''}, {stats.failed} failed")
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
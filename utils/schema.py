@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# Bit i of the `habits` column is HABITS[i]
+HABITS = ["water", "reading", "meditation", "exercise"]
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+COMPACT_COLUMNS = {"day": "int32", "habits": "uint8", "mood": "category"}
+
+
+def empty_compact():
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in COMPACT_COLUMNS.items()})
+
+
+def to_compact(raw):
+    """
+    Converts raw logs (list of dicts or a DataFrame in the backend/CSV shape) into
+    the compact in-memory schema:
+      day    int32     days since 1970-01-01
+      habits uint8     bitmask over HABITS
+      mood   category
+    Returns (frame, journals) where journals maps day -> journal text. Rows with an
+    unparseable date are dropped; for duplicate dates the last entry wins.
+    """
+    raw = pd.DataFrame(raw)
+    if raw.empty or "date" not in raw.columns:
+        return empty_compact(), {}
+
+    dates = pd.to_datetime(raw["date"], errors="coerce", format="mixed")
+    valid = dates.notna().to_numpy()
+    if not valid.all():
+        logger.warning("Skipping %d logs with an invalid date", int((~valid).sum()))
+    raw = raw[valid]
+    days = dates[valid].to_numpy().astype("datetime64[D]").astype(np.int64).astype(np.int32)
+
+    bits = np.zeros(len(raw), dtype=np.uint8)
+    for i, habit in enumerate(HABITS):
+        if habit in raw.columns:
+            done = pd.to_numeric(raw[habit], errors="coerce").fillna(0).to_numpy() > 0
+            bits |= (done.astype(np.uint8) << i)
+
+    mood = raw["mood"] if "mood" in raw.columns else pd.Series(None, index=raw.index, dtype=object)
+    frame = pd.DataFrame({
+        "day": days,
+        "habits": bits,
+        "mood": pd.Categorical(mood.where(mood.notna(), None).to_numpy()),
+    })
+
+    last = ~frame["day"].duplicated(keep="last").to_numpy()
+    journals = {}
+    if "journal_text" in raw.columns:
+        for day, text in zip(days[last], raw["journal_text"].to_numpy()[last]):
+            if isinstance(text, str) and text:
+                journals[int(day)] = text
+
+    frame = frame[last].sort_values(by="day", ignore_index=True)
+    return frame, journals
+
+
+def habit_matrix(frame):
+    """Unpacks the bitmask into an (n_days, len(HABITS)) uint8 matrix of 0/1."""
+    bits = frame["habits"].to_numpy(dtype=np.uint8)
+    return (bits[:, None] >> np.arange(len(HABITS), dtype=np.uint8)) & 1
+
+
+def day_index(frame):
+    """The `day` column as a DatetimeIndex."""
+    return pd.DatetimeIndex(_EPOCH + frame["day"].to_numpy().astype("timedelta64[D]"), name="date")
+
+
+def day_to_iso(day):
+    return str(_EPOCH + np.timedelta64(int(day), "D"))
+
+
+def iso_to_day(iso_date):
+    return int(np.datetime64(iso_date, "D").astype(np.int64))
+
+
+def to_records(frame, journals):
+    """Converts the compact frame (plus journals) back to the /get_all_logs shape."""
+    matrix = habit_matrix(frame)
+    records = []
+    for row, (day, mood) in enumerate(zip(frame["day"].to_numpy(), frame["mood"].to_numpy())):
+        record = {"date": day_to_iso(day)}
+        record.update({habit: int(matrix[row, i]) for i, habit in enumerate(HABITS)})
+        record["mood"] = mood if isinstance(mood, str) else None
+        record["journal_text"] = journals.get(int(day))
+        records.append(record)
+    return records
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class StreakRun(NamedTuple):
+    start: date
+    end: date
+    length: int
+
+
+class StreakSummary(NamedTuple):
+    current: int
+    longest: int
+    runs: list # StreakRun entries, oldest first
+
+
+def _day_ordinals(dates):
+    """Converts any date-like sequence to sorted, unique day numbers (days since epoch)."""
+    days = pd.to_datetime(pd.Series(dates)).dropna().values.astype("datetime64[D]")
+    return np.unique(days.astype(np.int64))
+
+
+def compute_streaks(dates, today=None):
+    """
+    Computes the current streak, the longest streak and every streak run in one pass.
+    Consecutive days are grouped with run-length encoding on day ordinals, so the
+    cost is a sort plus a few vectorized array ops regardless of streak length.
+    A current streak counts if it reaches today or yesterday.
+    """
+    days = _day_ordinals(dates)
+    if days.size == 0:
+        return StreakSummary(0, 0, [])
+
+    # A new run starts wherever the gap to the previous day isn't exactly 1
+    starts = np.flatnonzero(np.r_[True, np.diff(days) != 1])
+    ends = np.r_[starts[1:] - 1, days.size - 1]
+    lengths = ends - starts + 1
+
+    epoch = np.datetime64("1970-01-01", "D")
+    start_dates = (epoch + days[starts]).astype(object)
+    end_dates = (epoch + days[ends]).astype(object)
+    runs = [StreakRun(s, e, int(n)) for s, e, n in zip(start_dates, end_dates, lengths)]
+
+    # --- Current streak: the run holding today, else the one holding yesterday ---
+    today = np.datetime64(today or date.today(), "D").astype(np.int64)
+    current = 0
+    for anchor in (today, today - 1):
+        idx = np.searchsorted(days, anchor)
+        if idx < days.size and days[idx] == anchor:
+            run = np.searchsorted(starts, idx, side="right") - 1
+            current = int(anchor - days[starts[run]] + 1)
+            break
+
+    return StreakSummary(current, int(lengths.max()), runs)
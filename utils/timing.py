@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+
+import streamlit as st
+
+from utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Timing config ---
+# MINDTRACK_TIMINGS=1 times every run (log lines only); MINDTRACK_DEBUG=1 shows the sidebar toggle
+TIMINGS_ENABLED = os.getenv("MINDTRACK_TIMINGS", "").lower() in ("1", "true", "yes")
+DEBUG_PANEL = os.getenv("MINDTRACK_DEBUG", "").lower() in ("1", "true", "yes")
+DEBUG_TOGGLE_KEY = "debug_timings"
+
+_local = threading.local() # Stages recorded by the current script run (one thread per run)
+
+
+def _session_enabled():
+    if not DEBUG_PANEL:
+        return False
+    try:
+        return bool(st.session_state.get(DEBUG_TOGGLE_KEY, False))
+    except Exception: # No script run context (background thread, tests, benchmarks)
+        return False
+
+
+def is_enabled():
+    return TIMINGS_ENABLED or _session_enabled()
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("name", "fields", "_start", "_depth")
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self._depth = getattr(_local, "depth", 0)
+        _local.depth = self._depth + 1
+        self._start = time.perf_counter()
+        return self
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self._start) * 1000
+        _local.depth = self._depth
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        records = getattr(_local, "records", None)
+        if records is not None:
+            records.append((self.name, ms, self._depth, dict(self.fields)))
+        extra = "".join(f" {k}={v}" for k, v in self.fields.items())
+        logger.info("stage=%s ms=%.1f%s", self.name, ms, extra, extra={"rate_limit": False})
+        return False
+
+
+def stage(name, **fields):
+    """
+    Times the `with` block as stage `name` when timings are enabled, otherwise a shared
+    no-op context. Extra fields (e.g. rows=...) are logged with it; more can be added
+    inside the block with `.set(...)` on the yielded object.
+    """
+    if not is_enabled():
+        return _NOOP
+    return _Stage(name, fields)
+
+
+def debug_toggle():
+    """
+    Call at the top of a page's sidebar. Starts a fresh list of recorded stages for this
+    run and, with MINDTRACK_DEBUG set, shows the toggle for the timings panel.
+    """
+    _local.records = []
+    if DEBUG_PANEL:
+        st.toggle("⏱️ Show timings", key=DEBUG_TOGGLE_KEY)
+
+
+def render_debug_panel():
+    """Call at the end of a page: shows the stages recorded during this run in the sidebar."""
+    records = getattr(_local, "records", None)
+    if not records or not _session_enabled():
+        return
+    with st.sidebar.expander("⏱️ Timings", expanded=True):
+        for name, ms, depth, fields in records:
+            detail = ", ".join(f"{k}={v}" for k, v in fields.items())
+            indent = "↳ " * depth # Nested stages are part of their parent's time
+            st.caption(f"{indent}**{name}** {ms:,.1f} ms" + (f" ({detail})" if detail else ""))
+        total = sum(ms for _, ms, depth, _ in records if depth == 0)
+        st.caption(f"Total: {total:,.1f} ms")